@@ -1,10 +1,11 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from flask_jwt_extended import (
     JWTManager, create_access_token, create_refresh_token,
     jwt_required, get_jwt_identity, get_jwt
 )
 import os
+import json
 import logging
 import secrets
 from datetime import datetime, timedelta, timezone
@@ -16,8 +17,9 @@ load_dotenv()
 from models import db, User
 from auth import token_required, get_current_user
 from services.sfia_km_service import get_sfia_service
-from services.jd_services import get_enhancer, reset_enhancer, create_jd as create_jd_service, enhance_jd as enhance_jd_service
+from services.jd_services import get_enhancer, reset_enhancer, create_jd as create_jd_service, enhance_jd as enhance_jd_service, validate_enhancement_input
 from services.email_service import send_verification_email
+from services.job_queue import enqueue_enhance, get_job
 import time
 from analytics import (
     track_enhancement_request,
@@ -387,7 +389,8 @@ def kg_health_check():
                 'connected': True,
                 'fuseki_url': sfia_service.fuseki_url,
                 'dataset': sfia_service.dataset,
-                'stats': stats
+                'stats': stats,
+                'cache': sfia_service.get_cache_stats()
             }), 200
         else:
             return jsonify({
@@ -539,11 +542,10 @@ def enhance_jd_endpoint():
             logger.info(f"Org context provided: {list(org_context.keys())}")
         
         # JD is optional - can generate from context alone
-        if not job_description and not org_context:
-            logger.warning("Enhancement failed: No job description or context provided")
-            return jsonify({
-                'error': 'Please provide either a job description or fill in the context fields'
-            }), 400
+        input_error = validate_enhancement_input(job_description, org_context)
+        if input_error:
+            logger.warning(f"Enhancement failed: {input_error}")
+            return jsonify({'error': input_error}), 400
         
         # Track enhancement request
         start_time = time.time()
@@ -632,6 +634,137 @@ def enhance_jd_endpoint():
             'error': str(e)
         }), 500
 
+@app.route('/api/enhance-jd/stream', methods=['POST'])
+@jwt_required()
+def enhance_jd_stream_endpoint():
+    """
+    Streaming variant of /api/enhance-jd (Protected)
+    
+    Accepts the same request body and responds with Server-Sent Events: one
+    event per workflow stage (keywords, keyword_matched, sfia_skills, skills)
+    as soon as it is ready, 'jd_token' events as the JD is regenerated, then a
+    'complete' event carrying the full result or an 'error' event.
+    """
+    logger.info("POST /api/enhance-jd/stream - Streaming enhancement request received")
+    current_user_id = get_jwt_identity()
+    
+    data = request.get_json() or {}
+    job_description = data.get('job_description', '')
+    org_context = data.get('org_context', {})
+    
+    # JD is optional - can generate from context alone
+    input_error = validate_enhancement_input(job_description, org_context)
+    if input_error:
+        logger.warning(f"Enhancement failed: {input_error}")
+        return jsonify({'error': input_error}), 400
+    
+    start_time = time.time()
+    track_enhancement_request(
+        user_id=str(current_user_id),
+        jd_length=len(job_description),
+        has_org_context=bool(org_context)
+    )
+    
+    def sse(event):
+        return f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+    
+    def generate():
+        try:
+            enhancer = get_enhancer()
+            for event in enhancer.stream_enhance(job_description, org_context=org_context):
+                if event['stage'] == 'complete':
+                    result = event['result']
+                    track_enhancement_success(
+                        user_id=str(current_user_id),
+                        skills_count=result.get('skills_count', 0),
+                        duration_ms=int((time.time() - start_time) * 1000),
+                        llm_provider=getattr(enhancer, 'llm_provider', 'unknown'),
+                        kg_connected=result.get('knowledge_graph_connected', False)
+                    )
+                yield sse(event)
+        except Exception as e:
+            logger.error(f"Error streaming JD enhancement: {str(e)}", exc_info=True)
+            track_enhancement_failure(
+                user_id=str(current_user_id),
+                error=str(e),
+                duration_ms=int((time.time() - start_time) * 1000)
+            )
+            yield sse({'stage': 'error', 'error': str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/enhance-jd/jobs', methods=['POST'])
+@jwt_required()
+def enqueue_enhance_jd_endpoint():
+    """
+    Queue a JD enhancement for a background worker (Protected)
+    
+    Accepts the same request body as /api/enhance-jd and responds 202 with a
+    job_id; poll /api/enhance-jd/jobs/<job_id> for the result. Requires
+    REDIS_URL and at least one running worker (python worker.py).
+    """
+    logger.info("POST /api/enhance-jd/jobs - Queued enhancement request received")
+    current_user_id = get_jwt_identity()
+    
+    data = request.get_json() or {}
+    job_description = data.get('job_description', '')
+    org_context = data.get('org_context', {})
+    
+    # JD is optional - can generate from context alone
+    input_error = validate_enhancement_input(job_description, org_context)
+    if input_error:
+        logger.warning(f"Enhancement failed: {input_error}")
+        return jsonify({'error': input_error}), 400
+    
+    try:
+        job_id = enqueue_enhance(job_description, org_context=org_context, user_id=str(current_user_id))
+    except RuntimeError as e:
+        logger.warning(f"Enhancement queue unavailable: {e}")
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        logger.error(f"Error queueing JD enhancement: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+    
+    track_enhancement_request(
+        user_id=str(current_user_id),
+        jd_length=len(job_description),
+        has_org_context=bool(org_context)
+    )
+    
+    return jsonify({'success': True, 'job_id': job_id, 'status': 'queued'}), 202
+
+@app.route('/api/enhance-jd/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_enhance_jd_job_endpoint(job_id):
+    """
+    Get the status of a queued JD enhancement (Protected)
+    
+    Responds with 'status' (queued, running, complete or failed) and, once
+    finished, the enhancement 'result' or an 'error'.
+    """
+    current_user_id = get_jwt_identity()
+    
+    try:
+        job = get_job(job_id)
+    except Exception as e:
+        logger.error(f"Error reading enhancement job {job_id}: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+    
+    # Other users' jobs are reported as missing rather than forbidden
+    if job is None or job.get('user_id') != str(current_user_id):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response = {'job_id': job_id, 'status': job['status']}
+    if job['status'] == 'complete':
+        response['result'] = job['result']
+    elif job['status'] == 'failed':
+        response['error'] = job.get('error', '')
+    return jsonify(response)
+
 @app.route('/api/create-interview-plan', methods=['POST'])
 @jwt_required()
 def create_interview_plan_endpoint():
@@ -3,6 +3,8 @@ Prompts for Job Description Enhancement Service
 All LLM prompts used in the enhancement workflow
 """
 
+import re
+
 # Prompt for extracting skills from job description
 SKILL_EXTRACTION_PROMPT = """You are an expert at analyzing job descriptions and extracting technical skills, 
 competencies, and required capabilities. Extract all relevant skills mentioned in the job description.
@@ -16,6 +18,80 @@ Focus on:
 Return ONLY a comma-separated list of skill keywords, no explanations."""
 
 
+# Prompt for extracting skills when the response is a structured skill list
+STRUCTURED_SKILL_EXTRACTION_PROMPT = """You are an expert at analyzing job descriptions and extracting technical skills, 
+competencies, and required capabilities. Extract all relevant skills mentioned in the job description.
+
+Focus on:
+- Technical skills (programming languages, tools, technologies)
+- Professional competencies (project management, communication, leadership)
+- Domain expertise (data analysis, software development, cybersecurity, etc.)
+- Soft skills when explicitly mentioned
+
+Return each skill as its own list item: a short keyword, no explanations."""
+
+
+# Prompt for extracting skills from several job descriptions in one call
+BATCH_SKILL_EXTRACTION_PROMPT = """You are an expert at analyzing job descriptions and extracting technical skills, 
+competencies, and required capabilities. You will receive several job descriptions, each introduced by
+its numeric JD ID. Extract all relevant skills mentioned in each one independently.
+
+Focus on:
+- Technical skills (programming languages, tools, technologies)
+- Professional competencies (project management, communication, leadership)
+- Domain expertise (data analysis, software development, cybersecurity, etc.)
+- Soft skills when explicitly mentioned
+
+Return exactly one result per job description, tagged with its JD ID. Each skill is a short keyword, no explanations."""
+
+
+# Prompt for picking SFIA skill codes directly; the skill catalogue is appended
+SFIA_CODE_EXTRACTION_PROMPT = """You are an expert at analyzing job descriptions and mapping them to the SFIA framework.
+Identify the SFIA skills the job description requires, choosing only from the catalogue below.
+
+Focus on:
+- Technical skills (programming languages, tools, technologies)
+- Professional competencies (project management, communication, leadership)
+- Domain expertise (data analysis, software development, cybersecurity, etc.)
+
+Return each matching skill's code as its own list item, most relevant first, at most 20 codes.
+Do not invent codes that are not in the catalogue.
+
+SFIA skill catalogue (code, name, category):
+"""
+
+
+# Placeholder the fused prompt asks the LLM to leave for the competency section
+COMPETENCY_PLACEHOLDER = "{{COMPETENCY_EXPECTATIONS}}"
+
+
+# Prompt for extracting skills and rewriting the job description in one call
+FUSED_ENHANCEMENT_PROMPT = """You are an expert HR consultant who analyzes job descriptions and rewrites them as compelling, professional postings.
+
+Do two things with the provided job description:
+
+1. EXTRACT all relevant skills mentioned in it: technical skills, professional competencies,
+   domain expertise, and soft skills when explicitly mentioned. Return each skill as its own
+   list item: a short keyword, no explanations.
+
+2. REWRITE it as a polished job description using this structure:
+   - Role Mandate and Capability
+   - Why [Company Name]
+   - The Impact You'll Create
+   - Your Mandate & Ownership (Responsibilities)
+   - Mandatory Skills (Essential Skills)
+   - Desired Skills (What Sets You Apart)
+   - How We Work & Operating Principles
+
+   Directly after the Mandatory Skills section, add a line containing only """ + COMPETENCY_PLACEHOLDER + """
+   A competency expectations section will be inserted there; do not write it yourself.
+
+OUTPUT the rewritten job description in plain text format (not markdown):
+   - Section headers in Title Case followed by a blank line
+   - Bullet points with simple dashes (-)
+   - No special characters like #, *, **, or ```"""
+
+
 # Prompt for regenerating job description with SFIA skills and organizational context
 JD_REGENERATION_SYSTEM_PROMPT = """You are an expert HR consultant who creates compelling, professional job descriptions that attract top talent.
 
@@ -99,6 +175,38 @@ def get_skill_extraction_prompt():
     return SKILL_EXTRACTION_PROMPT
 
 
+def get_structured_skill_extraction_prompt():
+    """Get the system prompt for skill extraction with structured output"""
+    return STRUCTURED_SKILL_EXTRACTION_PROMPT
+
+
+def get_batch_skill_extraction_prompt():
+    """Get the system prompt for extracting skills from several JDs at once"""
+    return BATCH_SKILL_EXTRACTION_PROMPT
+
+
+def get_fused_enhancement_prompt():
+    """Get the system prompt for combined skill extraction and JD rewriting"""
+    return FUSED_ENHANCEMENT_PROMPT
+
+
+def get_sfia_code_extraction_prompt(skill_catalogue: list) -> str:
+    """
+    Get the system prompt for picking SFIA codes directly from a job description
+    
+    Args:
+        skill_catalogue: Skill dictionaries with code, name and category
+    
+    Returns:
+        Prompt ending with one catalogue line per skill
+    """
+    lines = [
+        f"{skill['code']}\t{skill['name']}\t{skill.get('category', '')}"
+        for skill in skill_catalogue
+    ]
+    return SFIA_CODE_EXTRACTION_PROMPT + "\n".join(lines)
+
+
 def get_jd_regeneration_system_prompt():
     """Get the system prompt for JD regeneration"""
     return JD_REGENERATION_SYSTEM_PROMPT
@@ -139,11 +247,75 @@ What This Level Means: {level_description}"""
     return "\n\n".join(skills_text)
 
 
+def format_competency_section(enhanced_skills: list) -> str:
+    """
+    Format the competency expectations section filled into a fused JD outline.
+    
+    Like the regeneration prompt, this omits skill codes and level numbers.
+    
+    Args:
+        enhanced_skills: List of skill dictionaries with name and level_description
+    
+    Returns:
+        Plain text section, or an empty string when there are no skills
+    """
+    if not enhanced_skills:
+        return ""
+    
+    lines = ["Competency Expectations", ""]
+    for skill in enhanced_skills:
+        name = skill.get('name', skill.get('label', 'Unknown'))
+        level_description = skill.get('level_description', '')
+        lines.append(f"- {name}: {level_description}" if level_description else f"- {name}")
+    
+    return "\n".join(lines)
+
+
+def fill_jd_outline(jd_outline: str, enhanced_skills: list) -> str:
+    """
+    Insert the competency expectations section into a fused JD outline.
+    
+    Args:
+        jd_outline: JD written by the fused prompt, normally containing COMPETENCY_PLACEHOLDER
+        enhanced_skills: List of skill dictionaries with name and level_description
+    
+    Returns:
+        Finished job description (the section is appended if the placeholder is missing)
+    """
+    section = format_competency_section(enhanced_skills)
+    if COMPETENCY_PLACEHOLDER in jd_outline:
+        jd_text = jd_outline.replace(COMPETENCY_PLACEHOLDER, section)
+    elif section:
+        jd_text = f"{jd_outline.rstrip()}\n\n{section}"
+    else:
+        jd_text = jd_outline
+    
+    # Collapse the blank lines left around an empty section
+    return re.sub(r"\n{3,}", "\n\n", jd_text).strip()
+
+
 def format_skill_extraction_user_prompt(job_description: str) -> str:
     """Format the user prompt for skill extraction"""
     return f"Extract skills from this job description:\n\n{job_description}"
 
 
+def format_batch_skill_extraction_user_prompt(job_descriptions: list) -> str:
+    """
+    Format the user prompt for batch skill extraction
+    
+    Args:
+        job_descriptions: Job description texts; each is identified by its list index
+    
+    Returns:
+        Prompt listing every JD under its JD ID
+    """
+    sections = [
+        f"=== JD ID: {jd_id} ===\n{job_description}"
+        for jd_id, job_description in enumerate(job_descriptions)
+    ]
+    return "Extract skills from each of these job descriptions:\n\n" + "\n\n".join(sections)
+
+
 def format_org_context(org_context: dict) -> str:
     """
     Format organizational context for inclusion in the prompt.
@@ -259,6 +431,25 @@ Our Operating Principles
     return prompt
 
 
+def format_fused_enhancement_user_prompt(job_description: str, org_context: dict = None) -> str:
+    """
+    Format the user prompt for combined skill extraction and JD rewriting.
+    
+    Args:
+        job_description: The original job description text
+        org_context: Optional dictionary containing organizational context
+    
+    Returns:
+        Formatted user prompt for the fused call
+    """
+    org_context_str = format_org_context(org_context) if org_context else ""
+    return f"""Job Description:
+{job_description}
+{org_context_str}
+
+Extract the skills from this job description and rewrite it as a polished, professional posting."""
+
+
 def format_jd_creation_user_prompt(org_context: dict) -> str:
     """
     Format the user prompt for JD creation from organizational context only.
@@ -0,0 +1,18 @@
+"""
+Category count refresh
+Stores per-category SFIA skill counts in the knowledge graph; run after every SFIA import
+
+Usage:
+    python refresh_category_counts.py
+"""
+
+import sys
+
+# Load environment variables from .env file
+from dotenv import load_dotenv
+load_dotenv()
+
+from services.sfia_km_service import get_sfia_service
+
+if __name__ == '__main__':
+    sys.exit(0 if get_sfia_service().refresh_category_counts() else 1)
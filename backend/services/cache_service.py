@@ -0,0 +1,436 @@
+"""
+Cache Service
+Two-tier cache for deterministic lookups: a process-local LRU in front of an
+optional shared Redis instance (enabled when REDIS_URL is set) or, without
+Redis, an optional on-disk cache (enabled when CACHE_DIR is set), plus a
+semantic cache that matches near-duplicate texts by embedding similarity
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+import logging
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _dumps(value):
+    """Serialize a Redis payload (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        # Stringify int keys (e.g. skill level numbers) as json.dumps does
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value)
+
+
+def _loads(payload):
+    """Deserialize a Redis payload written by _dumps"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+class CacheService:
+    """
+    Process-local LRU cache backed by an optional shared tier (Redis, or a disk
+    cache when Redis is not configured); both tiers expire entries after ttl
+    """
+    
+    def __init__(self, namespace, maxsize=4096, ttl=None, redis_client=None):
+        """
+        Initialize the cache
+        
+        Args:
+            namespace: Key prefix used for the Redis tier (e.g. 'sfia')
+            maxsize: Maximum number of entries held in process
+            ttl: Expiry in seconds (defaults to KG_CACHE_TTL env var or 24h)
+            redis_client: Optional Redis client (defaults to the shared client)
+        """
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl or int(os.getenv('KG_CACHE_TTL', '86400'))
+        self._redis = redis_client if redis_client is not None else _get_redis_client()
+        # Disk tier survives restarts of single-host deployments without Redis
+        self._disk = _get_disk_cache() if self._redis is None else None
+        
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _redis_key(self, key):
+        return f"{self.namespace}:{key}"
+    
+    def get(self, key, default=None):
+        """
+        Look up a key, checking the local tier before Redis
+        
+        Args:
+            key: Cache key (without namespace)
+            default: Value returned on a miss
+        
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._local.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._local[key]
+        
+        if self._redis is not None:
+            try:
+                payload = self._redis.get(self._redis_key(key))
+                if payload is not None:
+                    value = _loads(payload)
+                    self._store_local(key, value)
+                    with self._lock:
+                        self.hits += 1
+                    return value
+            except Exception as e:
+                logger.debug(f"Redis get failed for {key}: {e}")
+        elif self._disk is not None:
+            try:
+                payload = self._disk.get(self._redis_key(key))
+                if payload is not None:
+                    value = _loads(payload)
+                    self._store_local(key, value)
+                    with self._lock:
+                        self.hits += 1
+                    return value
+            except Exception as e:
+                logger.debug(f"Disk cache get failed for {key}: {e}")
+        
+        with self._lock:
+            self.misses += 1
+        return default
+    
+    def set(self, key, value):
+        """
+        Store a JSON-serializable value in both tiers
+        
+        Args:
+            key: Cache key (without namespace)
+            value: Value to store
+        """
+        self._store_local(key, value)
+        
+        if self._redis is not None:
+            try:
+                self._redis.set(self._redis_key(key), _dumps(value), ex=self.ttl)
+            except Exception as e:
+                logger.debug(f"Redis set failed for {key}: {e}")
+        elif self._disk is not None:
+            try:
+                self._disk.set(self._redis_key(key), _dumps(value), expire=self.ttl)
+            except Exception as e:
+                logger.debug(f"Disk cache set failed for {key}: {e}")
+    
+    def purge(self):
+        """
+        Remove every entry in this namespace from the local and shared tiers
+        
+        Other processes' local tiers keep their copies until they expire.
+        """
+        with self._lock:
+            self._local.clear()
+        
+        prefix = self._redis_key('')
+        if self._redis is not None:
+            try:
+                keys = list(self._redis.scan_iter(match=f"{prefix}*", count=500))
+                if keys:
+                    self._redis.delete(*keys)
+            except Exception as e:
+                logger.debug(f"Redis purge failed for {self.namespace}: {e}")
+        elif self._disk is not None:
+            try:
+                for key in list(self._disk.iterkeys()):
+                    if isinstance(key, str) and key.startswith(prefix):
+                        self._disk.delete(key)
+            except Exception as e:
+                logger.debug(f"Disk cache purge failed for {self.namespace}: {e}")
+    
+    def _store_local(self, key, value):
+        with self._lock:
+            self._local[key] = (value, time.monotonic() + self.ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+    
+    def clear(self):
+        """Clear the process-local tier (shared-tier entries expire via their own TTL)"""
+        with self._lock:
+            self._local.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        """Get hit/miss counters for this cache"""
+        with self._lock:
+            return {
+                'namespace': self.namespace,
+                'size': len(self._local),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'redis': self._redis is not None,
+                'disk': self._disk is not None
+            }
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache keyed by text embeddings
+    
+    Vectors are L2-normalized so an inner product is the cosine similarity; the
+    matrix is searched exhaustively, which is exact and fast at cache sizes of a
+    few thousand entries. Entries are mirrored to a Redis list when available so
+    workers and restarts share them.
+    """
+    
+    def __init__(self, namespace, embeddings, threshold=0.95, maxsize=1000, redis_client=None):
+        """
+        Initialize the semantic cache
+        
+        Args:
+            namespace: Redis list key suffix (e.g. 'extract_skills')
+            embeddings: LangChain Embeddings instance used to embed lookups
+            threshold: Minimum cosine similarity for a hit
+            maxsize: Maximum number of entries (oldest evicted first)
+            redis_client: Optional Redis client (defaults to the shared client)
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for the semantic cache")
+        
+        self.namespace = namespace
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._redis = redis_client if redis_client is not None else _get_redis_client()
+        
+        self._vectors = None
+        self._values = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        self._load()
+    
+    def _redis_key(self):
+        return f"semantic:{self.namespace}"
+    
+    def _load(self):
+        """Load persisted entries from Redis"""
+        if self._redis is None:
+            return
+        try:
+            for payload in self._redis.lrange(self._redis_key(), -self.maxsize, -1):
+                entry = _loads(payload)
+                self._append(np.asarray(entry['vector'], dtype=np.float32), entry['value'])
+            if self._values:
+                logger.info(f"Loaded {len(self._values)} semantic cache entries for {self.namespace}")
+        except Exception as e:
+            logger.debug(f"Semantic cache load failed for {self.namespace}: {e}")
+    
+    def embed(self, text):
+        """Embed and L2-normalize a text"""
+        vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, text):
+        """
+        Find the cached value for the most similar prior text
+        
+        Args:
+            text: Text to look up
+        
+        Returns:
+            Tuple of (cached value or None, query vector for a follow-up add())
+        """
+        vector = self.embed(text)
+        
+        with self._lock:
+            if self._vectors is not None:
+                scores = self._vectors @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self.hits += 1
+                    return self._values[best], vector
+            self.misses += 1
+        
+        return None, vector
+    
+    def add(self, vector, value):
+        """
+        Store a JSON-serializable value under an embedding from lookup()
+        
+        Args:
+            vector: Normalized embedding returned by lookup()
+            value: Value to cache
+        """
+        with self._lock:
+            self._append(vector, value)
+        
+        if self._redis is not None:
+            try:
+                payload = _dumps({'vector': vector.tolist(), 'value': value})
+                pipe = self._redis.pipeline()
+                pipe.rpush(self._redis_key(), payload)
+                pipe.ltrim(self._redis_key(), -self.maxsize, -1)
+                pipe.execute()
+            except Exception as e:
+                logger.debug(f"Semantic cache persist failed for {self.namespace}: {e}")
+    
+    def _append(self, vector, value):
+        row = vector.reshape(1, -1)
+        self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+        self._values.append(value)
+        if len(self._values) > self.maxsize:
+            self._vectors = self._vectors[-self.maxsize:]
+            self._values = self._values[-self.maxsize:]
+    
+    def stats(self):
+        """Get hit/miss counters for this cache"""
+        with self._lock:
+            return {
+                'namespace': self.namespace,
+                'size': len(self._values),
+                'maxsize': self.maxsize,
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'redis': self._redis is not None
+            }
+
+
+# Shared Redis client (None when Redis is not configured)
+_redis_client = None
+_redis_checked = False
+
+
+def _get_redis_client():
+    """Create the shared Redis client on first use if REDIS_URL is configured"""
+    global _redis_client, _redis_checked
+    
+    if _redis_checked:
+        return _redis_client
+    _redis_checked = True
+    
+    redis_url = os.getenv('REDIS_URL', '').strip()
+    if not redis_url:
+        return None
+    if not REDIS_AVAILABLE:
+        logger.warning("⚠️ REDIS_URL is set but the redis package is not installed")
+        return None
+    
+    try:
+        client = redis.Redis.from_url(redis_url, socket_timeout=2)
+        client.ping()
+        _redis_client = client
+        logger.info(f"✅ Redis cache connected: {redis_url}")
+    except Exception as e:
+        logger.warning(f"⚠️ Redis connection failed, using in-process cache only: {e}")
+    
+    return _redis_client
+
+
+def get_redis_client():
+    """Get the shared Redis client (None when REDIS_URL is not configured or unreachable)"""
+    return _get_redis_client()
+
+
+# Shared disk cache (None when CACHE_DIR is not configured)
+_disk_cache = None
+_disk_checked = False
+
+
+def _get_disk_cache():
+    """Open the shared disk cache on first use if CACHE_DIR is configured"""
+    global _disk_cache, _disk_checked
+    
+    if _disk_checked:
+        return _disk_cache
+    _disk_checked = True
+    
+    cache_dir = os.getenv('CACHE_DIR', '').strip()
+    if not cache_dir:
+        return None
+    if not DISKCACHE_AVAILABLE:
+        logger.warning("⚠️ CACHE_DIR is set but the diskcache package is not installed")
+        return None
+    
+    try:
+        _disk_cache = diskcache.Cache(cache_dir)
+        logger.info(f"✅ Disk cache opened: {cache_dir}")
+    except Exception as e:
+        logger.warning(f"⚠️ Disk cache unavailable, using in-process cache only: {e}")
+    
+    return _disk_cache
+
+
+# Cache instances by namespace
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace, maxsize=4096, ttl=None):
+    """
+    Get or create the cache for a namespace
+    
+    Args:
+        namespace: Key prefix for the cache
+        maxsize: Maximum number of entries held in process
+        ttl: Expiry in seconds
+    
+    Returns:
+        CacheService instance
+    """
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = CacheService(namespace, maxsize=maxsize, ttl=ttl)
+        return _caches[namespace]
+
+
+def reset_caches():
+    """Drop all cache instances and the shared-tier clients (useful for testing)"""
+    global _redis_client, _redis_checked, _disk_cache, _disk_checked
+    with _caches_lock:
+        _caches.clear()
+    _redis_client = None
+    _redis_checked = False
+    if _disk_cache is not None:
+        _disk_cache.close()
+    _disk_cache = None
+    _disk_checked = False
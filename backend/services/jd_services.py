@@ -5,28 +5,59 @@ Uses OpenAI (primary) or Ollama (fallback) LLM and SFIA Knowledge Graph
 """
 
 import os
-from typing import TypedDict, List, Dict, Any, Annotated
+import re
+import json
+import hashlib
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypedDict, List, Dict, Any, Annotated, Iterator, AsyncIterator, Callable, Optional
 from operator import add
 
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from pydantic import BaseModel, Field
 
 # Import both LLM providers
 try:
-    from langchain_openai import ChatOpenAI
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
 
 try:
-    from langchain_ollama import ChatOllama
+    from langchain_ollama import ChatOllama, OllamaEmbeddings
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from .sfia_km_service import get_sfia_service
+from .cache_service import SemanticCache, get_cache
 from prompts.enhance_jd_prompts import (
     get_skill_extraction_prompt,
+    get_structured_skill_extraction_prompt,
+    get_batch_skill_extraction_prompt,
+    format_batch_skill_extraction_user_prompt,
+    get_fused_enhancement_prompt,
+    format_fused_enhancement_user_prompt,
+    fill_jd_outline,
+    get_sfia_code_extraction_prompt,
     get_jd_regeneration_system_prompt,
     format_skill_extraction_user_prompt,
     format_jd_regeneration_user_prompt,
@@ -42,15 +73,411 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# SFIA level names
+_LEVEL_NAMES = {
+    1: "Follow",
+    2: "Assist",
+    3: "Apply",
+    4: "Enable",
+    5: "Ensure/Advise",
+    6: "Initiate/Influence",
+    7: "Set Strategy/Inspire/Mobilise"
+}
+
+# Standard SFIA level descriptions, used when the KG has none for a skill
+_LEVEL_DESCRIPTIONS = {
+    1: "Follows instructions and guidance. Learns basic principles and techniques.",
+    2: "Assists with tasks under supervision. Developing practical experience.",
+    3: "Applies skills independently. Takes responsibility for own work outcomes.",
+    4: "Enables others. Provides guidance to less experienced colleagues.",
+    5: "Ensures quality and best practices. Advises on complex issues.",
+    6: "Initiates strategic decisions. Influences organizational direction.",
+    7: "Sets strategy. Inspires and mobilizes teams for enterprise-wide initiatives."
+}
+
+
+# Level indicators by category: seniority categories in the priority order
+# _detect_seniority applies, followed by the level bumps used by _assign_level
+_LEVEL_INDICATORS = {
+    'lead': ('lead', 'architect', 'manager', 'head', 'director', 'principal'),
+    'senior': ('senior', 'principal', '5+ years', 'expert', '7+ years'),
+    'mid': ('mid-level', 'intermediate', '3-5 years', 'experienced'),
+    'junior': ('junior', 'entry', 'graduate', '0-2 years', 'beginner'),
+    'leadership': ('lead', 'manage', 'strategic', 'architect'),
+    'mentoring': ('mentor', 'train', 'guide', 'coach'),
+}
+
+# Base SFIA level for each detected seniority
+_SENIORITY_BASE_LEVELS = {
+    'junior': 2,
+    'mid': 4,
+    'senior': 5,
+    'lead': 6
+}
+
+
+def _build_indicator_matcher(indicators_by_category: Dict[str, tuple]):
+    """
+    Build a single-pass matcher for substring indicators
+    
+    The lookahead alternation tries every position once and reports the longest
+    indicator starting there; any shorter indicator matching at the same position
+    is a prefix of it, so each indicator also carries the categories of its prefixes.
+    
+    Returns:
+        Tuple of (compiled pattern, {indicator: frozenset of categories})
+    """
+    categories = {}
+    for category, indicators in indicators_by_category.items():
+        for indicator in indicators:
+            categories.setdefault(indicator, set()).add(category)
+    
+    hits = {
+        indicator: frozenset(
+            category
+            for prefix, prefix_categories in categories.items()
+            if indicator.startswith(prefix)
+            for category in prefix_categories
+        )
+        for indicator in categories
+    }
+    alternation = '|'.join(re.escape(i) for i in sorted(categories, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))"), hits
+
+
+_INDICATOR_PATTERN, _INDICATOR_HITS = _build_indicator_matcher(_LEVEL_INDICATORS)
+
+
+def _scan_indicators(text: str) -> frozenset:
+    """Return the indicator categories present in (lowercased) text in one pass"""
+    found = set()
+    for match in _INDICATOR_PATTERN.finditer(text):
+        found |= _INDICATOR_HITS[match.group(1)]
+    return frozenset(found)
+
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+# List markers and punctuation the LLM leaves around keywords ("- Python", "AWS.")
+_KEYWORD_EDGE_PUNCTUATION = re.compile(r"^[\s*\u2022\-(\[]+|[\s,;:!?.)\]]+$")
+
+# Bump when keyword post-processing or result formats change so cached
+# extractions and regenerations written by older code are not reused
+_CACHE_SCHEMA = 2
+
+# Deletion table for quotes the LLM wraps keywords in
+_QUOTE_TABLE = str.maketrans('', '', '"\'')
+
+# Tails that never change the skill ("SQL skills", "Kubernetes experience")
+_SKILL_SUFFIX = re.compile(r"\s+(?:skills?|experience)$")
+
+# Role words that only restate a single technology ("Python developer" -> "python")
+_ROLE_SUFFIX = re.compile(r"^([^\s]+)\s+(?:developer|programmer|engineer|specialist|expert)$")
+
+# Field words a role noun narrows into a distinct skill ("data engineer" is not "data")
+_BROAD_ROLE_WORDS = frozenset({
+    "application", "business", "cloud", "data", "database", "design", "devops",
+    "hardware", "it", "machine", "network", "platform", "product", "qa", "quality",
+    "security", "site", "software", "solutions", "support", "systems", "technical",
+    "test", "ux", "web",
+})
+
+
+# Normalized "keywords" the LLM extracts that never match an SFIA skill
+_SKILL_STOPWORDS = frozenset({
+    "ability", "dedicated", "detail oriented",
+    "driven", "dynamic", "excellent", "experienced", "fast learner", "hardworking",
+    "motivated", "passionate", "proactive", "self-starter", "strong", "team",
+    "team player", "willingness to learn",
+})
+
+
+def _is_searchable_keyword(keyword: str) -> bool:
+    """Whether a normalized keyword is worth a knowledge graph search"""
+    return keyword not in _SKILL_STOPWORDS and any(c.isalpha() for c in keyword)
+
+
+def _normalize_keyword(keyword: str) -> str:
+    """Normalized form used to de-duplicate keywords and key KG lookups"""
+    normalized = _WHITESPACE_RUN.sub(" ", keyword.strip().lower())
+    normalized = _KEYWORD_EDGE_PUNCTUATION.sub("", normalized)
+    normalized = _SKILL_SUFFIX.sub("", normalized)
+    role = _ROLE_SUFFIX.match(normalized)
+    if role and role.group(1) not in _BROAD_ROLE_WORDS:
+        return role.group(1)
+    return normalized
+
+
+# Input bounds: shorter JDs cannot carry skills, longer ones overrun the rewrite's output budget
+_MIN_JD_CHARS = int(os.getenv("ENHANCE_MIN_JD_CHARS", "20"))
+_MAX_JD_CHARS = int(os.getenv("ENHANCE_MAX_JD_CHARS", "30000"))
+
+
+def validate_enhancement_input(job_description: str, org_context: Dict[str, Any] = None):
+    """
+    Check an enhancement request before any LLM or KG work
+    
+    An empty JD is valid when organizational context is given (the JD is
+    created from context).
+    
+    Args:
+        job_description: The original job description
+        org_context: Optional organizational context dictionary
+        
+    Returns:
+        Error message, or None when the input is valid
+    """
+    text = (job_description or "").strip()
+    if not text:
+        if org_context:
+            return None
+        return "Please provide either a job description or fill in the context fields"
+    if len(text) < _MIN_JD_CHARS:
+        return f"Job description is too short (minimum {_MIN_JD_CHARS} characters)"
+    if len(text) > _MAX_JD_CHARS:
+        return f"Job description is too long (maximum {_MAX_JD_CHARS} characters)"
+    return None
+
+
+def _normalize_rows(vectors) -> "np.ndarray":
+    """L2-normalize embedding rows so inner products are cosine similarities"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _quantize_rows(matrix: "np.ndarray"):
+    """
+    Quantize embedding rows to int8 with a per-row scale (a quarter of the float32 size)
+    
+    Returns:
+        Tuple of (int8 matrix, float32 scales shaped to multiply a query x rows score matrix)
+    """
+    scales = np.abs(matrix).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)[None, :]
+
+
+# Shared pool for knowledge graph lookups started while the LLM is still streaming
+_KG_LOOKUP_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("KG_LOOKUP_WORKERS", "8")),
+    thread_name_prefix="kg-lookup"
+)
+
+
+class _ExtractionBatcher:
+    """
+    Coalesce skill extractions from concurrent workflows into packed LLM calls
+    
+    A request arriving while no other extraction is in flight is sent on alone at
+    once. Otherwise the first pending request opens a window; everything submitted
+    before it closes (or until max_size requests are waiting) is extracted in one
+    call. Every submit() must be paired with a done() once its extraction finishes.
+    """
+    
+    def __init__(self, extract_batch: Callable[[List[str]], List[List[str]]], window: float, max_size: int):
+        """
+        Args:
+            extract_batch: Extracts keywords for a list of JDs (None for JDs it misses)
+            window: Seconds to wait for more requests after the first
+            max_size: Requests that trigger an immediate flush
+        """
+        self._extract_batch = extract_batch
+        self._window = window
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+        self._in_flight = 0
+    
+    def submit(self, job_description: str) -> Optional[Future]:
+        """
+        Queue a JD for the next packed extraction
+        
+        Returns:
+            None when no other extraction is in flight (extract it alone now), else
+            a Future resolving to its keywords, or to None when it should still be
+            extracted on its own (nothing else arrived, or the response missed it)
+        """
+        with self._lock:
+            self._in_flight += 1
+            if self._in_flight == 1:
+                return None
+            future = Future()
+            self._pending.append((job_description, future))
+            batch = self._take() if len(self._pending) >= self._max_size else None
+            if batch is None and self._timer is None:
+                self._timer = threading.Timer(self._window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._run(batch)
+        return future
+    
+    def done(self):
+        """Mark a submitted extraction as finished"""
+        with self._lock:
+            self._in_flight -= 1
+    
+    def _take(self):
+        """Detach the pending requests (lock held)"""
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+    
+    def _flush(self):
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._run(batch)
+    
+    def _run(self, batch):
+        # A lone JD gains nothing from packing; its workflow streams it instead
+        if len(batch) == 1:
+            batch[0][1].set_result(None)
+            return
+        
+        try:
+            results = self._extract_batch([job_description for job_description, _ in batch])
+        except Exception as e:
+            logger.warning(f"⚠️ Packed extraction failed, extracting per JD: {e}")
+            results = [None] * len(batch)
+        for (_, future), keywords in zip(batch, results):
+            future.set_result(keywords)
+
+
+# Transient OpenAI failures (429, 5xx, timeouts) are retried by the client with
+# exponential backoff and jitter before a node gives up
+_LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+
+
+def _create_llm_rate_limiter():
+    """
+    Create the token-bucket limiter shared by every LLM client in the process
+    
+    Enabled by LLM_REQUESTS_PER_SECOND; LLM_MAX_BURST caps how many requests
+    may start back to back. Works for both threads and coroutines.
+    
+    Returns:
+        InMemoryRateLimiter instance, or None when unlimited
+    """
+    requests_per_second = float(os.getenv("LLM_REQUESTS_PER_SECOND", "0"))
+    if requests_per_second <= 0:
+        return None
+    return InMemoryRateLimiter(
+        requests_per_second=requests_per_second,
+        max_bucket_size=float(os.getenv("LLM_MAX_BURST", "5")),
+    )
+
+
+_LLM_RATE_LIMITER = _create_llm_rate_limiter()
+
+
+# System prompts are constant, so their messages are built once and shared by every request
+_TEXT_EXTRACTION_SYSTEM_MESSAGE = SystemMessage(content=get_skill_extraction_prompt())
+_STRUCTURED_EXTRACTION_SYSTEM_MESSAGE = SystemMessage(content=get_structured_skill_extraction_prompt())
+_BATCH_EXTRACTION_SYSTEM_MESSAGE = SystemMessage(content=get_batch_skill_extraction_prompt())
+_FUSED_ENHANCEMENT_SYSTEM_MESSAGE = SystemMessage(content=get_fused_enhancement_prompt())
+_JD_CREATION_SYSTEM_MESSAGE = SystemMessage(content=get_jd_creation_system_prompt())
+_JD_REGENERATION_SYSTEM_MESSAGE = SystemMessage(content=get_jd_regeneration_system_prompt())
+
+
+# Output budget for node 4: rewrites scale with the input JD and skill count,
+# created JDs with the role's seniority
+_JD_MAX_TOKENS = int(os.getenv("REGENERATE_MAX_TOKENS", "4000"))
+_JD_MIN_TOKENS = 800
+_JD_CREATION_TOKENS = {
+    'junior': 1500,
+    'mid': 2500,
+    'senior': 3500,
+    'lead': 4000
+}
+
+
+def _with_max_tokens(llm, max_tokens: int):
+    """
+    Copy of a chat model with a different output token cap
+    
+    Copies share the original's HTTP client and rate limiter.
+    """
+    fields = type(llm).model_fields
+    if "max_tokens" in fields:
+        return llm.model_copy(update={"max_tokens": max_tokens})
+    if "num_predict" in fields:
+        return llm.model_copy(update={"num_predict": max_tokens})
+    return llm
+
+
+def _rewrite_token_budget(job_description: str, skill_count: int) -> int:
+    """Output tokens for rewriting a JD: roughly twice its length plus the competency section"""
+    target = len(job_description) // 2 + 400 + 100 * skill_count
+    return min(_JD_MAX_TOKENS, max(_JD_MIN_TOKENS, target))
+
+
+def _creation_token_budget(org_context: Dict[str, Any]) -> int:
+    """Output tokens for creating a JD, sized by the seniority the context describes"""
+    text = " ".join(
+        str(org_context.get(field) or "")
+        for field in ("role_title", "role_grade", "business_context")
+    ).lower()
+    found = _scan_indicators(text)
+    seniority = next((level for level in ('lead', 'senior', 'mid', 'junior') if level in found), 'mid')
+    return min(_JD_MAX_TOKENS, _JD_CREATION_TOKENS[seniority])
+
+
+def _prompt_cache_key(llm, messages: List) -> str:
+    """Exact-match cache key for an LLM call: model, temperature and prompt messages"""
+    payload = json.dumps({
+        "schema": _CACHE_SCHEMA,
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", ""),
+        "temperature": getattr(llm, "temperature", None),
+        "messages": [message.content for message in messages],
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SkillList(BaseModel):
+    """Skills and competencies extracted from a job description"""
+    skills: List[str] = Field(description="Skill keywords, one per item, without explanations")
+
+
+class JDSkills(BaseModel):
+    """Skills extracted from one job description of a batch"""
+    jd_id: int = Field(description="JD ID the skills were extracted from")
+    skills: List[str] = Field(description="Skill keywords, one per item, without explanations")
+
+
+class SkillBatch(BaseModel):
+    """Skills extracted from several job descriptions, one result per JD"""
+    results: List[JDSkills]
+
+
+class SkillCodes(BaseModel):
+    """SFIA skills a job description requires, picked from the catalogue"""
+    codes: List[str] = Field(description="SFIA skill codes from the catalogue, most relevant first")
+
+
+class FusedEnhancement(BaseModel):
+    """Skills extracted from a job description together with its rewrite"""
+    skills: List[str] = Field(description="Skill keywords, one per item, without explanations")
+    jd_outline: str = Field(description="Rewritten job description containing the competency placeholder line")
+
+
 # Define the state structure for the graph
 class EnhancementState(TypedDict):
     """State object for the job description enhancement workflow"""
     job_description: str
     org_context: Dict[str, Any]  # Organizational context for JD generation
     extracted_keywords: List[str]
+    keyword_matches: Annotated[List[Dict[str, Any]], add]  # Per-keyword KG results from fan-out
     sfia_skills: List[Dict[str, Any]]
     enhanced_skills: List[Dict[str, Any]]
     regenerated_jd: str  # LLM-rewritten JD incorporating SFIA skills
+    jd_outline: str  # Fused-mode rewrite awaiting the competency section
     messages: Annotated[List, add]
     error: str
     kg_connected: bool
@@ -62,7 +489,13 @@ class JobDescriptionEnhancer:
     Uses OpenAI (primary) or Ollama (fallback) LLM and SFIA Knowledge Graph for skill mapping
     """
     
-    def __init__(self, fuseki_url: str = None, ollama_model: str = None, openai_model: str = None):
+    def __init__(
+        self,
+        fuseki_url: str = None,
+        ollama_model: str = None,
+        openai_model: str = None,
+        verify_llm: bool = None
+    ):
         """
         Initialize the Job Description Enhancer
         
@@ -70,9 +503,13 @@ class JobDescriptionEnhancer:
             fuseki_url: Fuseki server URL (defaults to FUSEKI_URL env var)
             ollama_model: Ollama model to use (defaults to OLLAMA_MODEL env var or 'llama3:latest')
             openai_model: OpenAI model to use (defaults to OPENAI_MODEL env var or 'gpt-4o-mini')
+            verify_llm: Send a test prompt to the LLM at startup (defaults to LLM_VERIFY env var
+                or False; otherwise only Ollama's server is pinged)
         """
         self.llm = None
         self.llm_provider = None
+        if verify_llm is None:
+            verify_llm = os.getenv("LLM_VERIFY", "false").lower() == "true"
         
         # Check for OpenAI API key first (primary)
         openai_api_key = os.getenv("OPENAI_API_KEY", "").strip()
@@ -80,14 +517,10 @@ class JobDescriptionEnhancer:
         
         if openai_api_key and OPENAI_AVAILABLE:
             try:
-                self.llm = ChatOpenAI(
-                    model=openai_model,
-                    api_key=openai_api_key,
-                    temperature=0.3,
-                    max_tokens=4000,
-                )
-                # Test connection with a simple request
-                self.llm.invoke("test")
+                self.llm = _build_openai_llm(openai_model)
+                # Invalid keys surface on the first real call unless verification is on
+                if verify_llm:
+                    self.llm.invoke("test")
                 self.llm_provider = "openai"
                 logger.info(f"✅ OpenAI LLM initialized: {openai_model}")
             except Exception as e:
@@ -100,13 +533,12 @@ class JobDescriptionEnhancer:
             ollama_model = ollama_model or os.getenv("OLLAMA_MODEL", "llama3:latest")
             
             try:
-                self.llm = ChatOllama(
-                    model=ollama_model,
-                    base_url=ollama_url,
-                    temperature=0.3,
-                )
-                # Test connection
-                self.llm.invoke("test")
+                self.llm = _build_ollama_llm(ollama_model)
+                # Test connection (listing models is cheap; a prompt loads the model)
+                if verify_llm or not HTTPX_AVAILABLE:
+                    self.llm.invoke("test")
+                else:
+                    httpx.get(f"{ollama_url}/api/tags", timeout=5).raise_for_status()
                 self.llm_provider = "ollama"
                 logger.info(f"✅ Ollama LLM initialized: {ollama_model}")
             except Exception as e:
@@ -121,20 +553,284 @@ class JobDescriptionEnhancer:
                 "  - OLLAMA_URL and ensure Ollama is running"
             )
         
+        # Skill extraction may run on a smaller, faster model than JD writing
+        self.extraction_llm = self._create_extraction_llm()
+        
+        # Structured extraction returns validated skill lists; providers without
+        # tool calling fall back to parsing a comma-separated response
+        try:
+            self.skill_extractor = self.extraction_llm.with_structured_output(SkillList)
+            self.batch_skill_extractor = self.extraction_llm.with_structured_output(SkillBatch)
+        except NotImplementedError:
+            self.skill_extractor = None
+            self.batch_skill_extractor = None
+        
+        # EXTRACTION_BATCH_WINDOW_MS > 0 packs extractions from concurrent requests
+        # into shared LLM calls; only requests arriving while another extraction is in
+        # flight wait for the window, so a request on its own is not delayed
+        self.extraction_batcher = None
+        window_ms = int(os.getenv("EXTRACTION_BATCH_WINDOW_MS", "0"))
+        if window_ms > 0 and self.batch_skill_extractor is not None:
+            self.extraction_batcher = _ExtractionBatcher(
+                self._extract_keywords_batch,
+                window=window_ms / 1000,
+                max_size=int(os.getenv("EXTRACTION_BATCH_SIZE", "20"))
+            )
+        
+        # Identical JDs reuse extracted keywords (EXTRACTION_CACHE_ENABLED, default on);
+        # the optional semantic cache extends this to near-duplicates
+        self.keyword_cache = None
+        if os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true":
+            self.keyword_cache = get_cache("extract_skills", maxsize=1024)
+        self.extraction_cache = self._create_semantic_cache("extract_skills")
+        
+        # Identical regeneration prompts can reuse the written JD (REGENERATION_CACHE_ENABLED,
+        # default off since a repeated request would otherwise get a fresh rewrite)
+        self.regeneration_cache = None
+        if os.getenv("REGENERATION_CACHE_ENABLED", "false").lower() == "true":
+            self.regeneration_cache = get_cache("regenerate_jd", maxsize=256)
+        
+        # With SEMANTIC_CACHE_ENABLED, near-duplicate prompts reuse a JD too; one cache per
+        # system prompt so JD creation and regeneration never share entries
+        self.regeneration_semantic_caches = {}
+        if self.regeneration_cache is not None:
+            threshold = float(os.getenv("SEMANTIC_REGENERATION_THRESHOLD", "0.97"))
+            for system_message in (_JD_CREATION_SYSTEM_MESSAGE, _JD_REGENERATION_SYSTEM_MESSAGE):
+                prompt_hash = hashlib.sha256(system_message.content.encode("utf-8")).hexdigest()[:12]
+                cache = self._create_semantic_cache(f"regenerate_jd:{prompt_hash}", threshold=threshold)
+                if cache is not None:
+                    self.regeneration_semantic_caches[system_message.content] = cache
+        
         # Initialize SFIA Knowledge Service
         self.sfia_service = get_sfia_service(fuseki_url=fuseki_url)
         self.kg_connected = self.sfia_service.is_connected()
         
         if self.kg_connected:
             logger.info("✅ Knowledge Graph integration enabled")
-            stats = self.sfia_service.get_knowledge_graph_stats()
-            logger.info(f"   📊 KG Stats: {stats.get('total_skills', 0)} skills, {stats.get('total_categories', 0)} categories")
+            # Counting skills and categories is extra KG queries only worth paying when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                stats = self.sfia_service.get_knowledge_graph_stats()
+                logger.debug(f"   📊 KG Stats: {stats.get('total_skills', 0)} skills, {stats.get('total_categories', 0)} categories")
+            
+            # Level descriptions are static reference data; load them once and
+            # index locally instead of querying Fuseki for every mapped skill
+            self._levels_cache = self.sfia_service.get_all_skill_levels_detail()
+            logger.info(f"   📚 Loaded level descriptions for {len(self._levels_cache)} skills")
+            
+            # Keyword searches score against the skill catalogue; fetch it now so
+            # the first request does not pay for it
+            catalogue_size = self.sfia_service.warm_cache()
+            logger.info(f"   📚 Prefetched skill catalogue: {catalogue_size} skills")
+            
+            self.skill_index = self._create_skill_index()
         else:
             logger.error("❌ Knowledge Graph not available")
             raise RuntimeError("Knowledge Graph is required but not available")
         
-        # Build the graph
+        # Build the graphs; creating a JD from context only needs node 4
         self.graph = self._build_graph()
+        self.creation_graph = self._build_creation_graph()
+        
+        # ENHANCE_DIRECT=true runs enhance() without the graph runtime (streaming
+        # and async entry points always use the graph)
+        self.direct_execution = os.getenv("ENHANCE_DIRECT", "false").lower() == "true"
+        
+        # ENHANCE_FUSED=true extracts skills and rewrites the JD in one LLM call; the
+        # competency section is then templated in from the KG instead of a second call
+        self.fused_enhancer = None
+        if os.getenv("ENHANCE_FUSED", "false").lower() == "true":
+            try:
+                self.fused_enhancer = self.llm.with_structured_output(FusedEnhancement)
+                logger.info("✅ Fused extraction + regeneration enabled")
+            except NotImplementedError:
+                logger.warning("⚠️ ENHANCE_FUSED needs structured output support, using separate calls")
+        
+        # EXTRACT_SFIA_CODES=true has the LLM pick SFIA codes from the catalogue, so
+        # node 1 resolves skills without a keyword-to-skill search
+        self.code_extractor = None
+        if os.getenv("EXTRACT_SFIA_CODES", "false").lower() == "true":
+            self._init_code_extraction()
+    
+    def _init_code_extraction(self):
+        """Set up direct SFIA code extraction (the catalogue rides in the constant system prompt)"""
+        try:
+            catalogue = self.sfia_service.get_skill_catalogue()
+            if not catalogue:
+                raise RuntimeError("skill catalogue is empty")
+            
+            self._skills_by_code = {
+                entry['code']: {
+                    'code': entry['code'],
+                    'name': entry['name'],
+                    'category': entry['category'],
+                    'description': entry['description'][:200],
+                }
+                for entry in catalogue
+            }
+            self._code_extraction_system_message = SystemMessage(
+                content=get_sfia_code_extraction_prompt(list(self._skills_by_code.values()))
+            )
+            self.code_extractor = self.extraction_llm.with_structured_output(SkillCodes)
+            logger.info(f"✅ Direct SFIA code extraction enabled: {len(self._skills_by_code)} skills")
+        except Exception as e:
+            logger.warning(f"⚠️ Direct SFIA code extraction disabled: {e}")
+            self.code_extractor = None
+    
+    def _create_extraction_llm(self):
+        """
+        Create the LLM used for skill extraction
+        
+        Keyword extraction is a simple information-extraction task, so
+        EXTRACT_MODEL (OpenAI) or OLLAMA_EXTRACT_MODEL (Ollama) can point it at a
+        smaller, cheaper model. OpenAI-compatible local servers (e.g. vLLM) are
+        reached by setting OPENAI_BASE_URL.
+        
+        Returns:
+            Dedicated extraction LLM, or a copy of the main LLM with the
+            extraction output cap when none is configured
+        """
+        # A keyword list needs far fewer output tokens than the main LLM's JD budget
+        max_tokens = int(os.getenv("EXTRACT_MAX_TOKENS", "1000"))
+        
+        try:
+            if self.llm_provider == "openai":
+                extract_model = os.getenv("EXTRACT_MODEL", "").strip()
+                if extract_model:
+                    llm = ChatOpenAI(
+                        model=extract_model,
+                        api_key=os.getenv("OPENAI_API_KEY", "").strip(),
+                        temperature=0,
+                        max_tokens=max_tokens,
+                        max_retries=_LLM_MAX_RETRIES,
+                        rate_limiter=_LLM_RATE_LIMITER,
+                    )
+                    logger.info(f"✅ Extraction LLM initialized: {extract_model}")
+                    return llm
+            elif self.llm_provider == "ollama":
+                extract_model = os.getenv("OLLAMA_EXTRACT_MODEL", "").strip()
+                if extract_model:
+                    llm = ChatOllama(
+                        model=extract_model,
+                        base_url=os.getenv("OLLAMA_URL", "http://localhost:11434"),
+                        temperature=0,
+                        num_predict=max_tokens,
+                        rate_limiter=_LLM_RATE_LIMITER,
+                    )
+                    logger.info(f"✅ Extraction LLM initialized: {extract_model}")
+                    return llm
+        except Exception as e:
+            logger.warning(f"⚠️ Extraction LLM initialization failed, using main LLM: {e}")
+        
+        return _with_max_tokens(self.llm, max_tokens)
+    
+    def _create_embeddings(self):
+        """Create the embeddings model for the active provider"""
+        if self.llm_provider == "openai":
+            return OpenAIEmbeddings(
+                model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
+                api_key=os.getenv("OPENAI_API_KEY", "").strip(),
+            )
+        return OllamaEmbeddings(
+            model=os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text"),
+            base_url=os.getenv("OLLAMA_URL", "http://localhost:11434"),
+        )
+    
+    def _create_skill_index(self):
+        """
+        Embed every SFIA skill once so keywords can be matched by similarity
+        
+        Enabled with SKILL_EMBEDDING_SEARCH=true; keywords are then mapped by cosine
+        similarity to each skill's name and description, which also catches synonyms
+        the text search misses. SKILL_EMBEDDING_MIN_SCORE sets the similarity a
+        match needs (default 0.35).
+        
+        Returns:
+            Tuple of (embeddings, int8 skill matrix, per-skill scales, skill records),
+            or None when disabled or unavailable
+        """
+        if os.getenv("SKILL_EMBEDDING_SEARCH", "false").lower() != "true":
+            return None
+        if not NUMPY_AVAILABLE:
+            logger.warning("⚠️ Skill embedding search disabled: numpy is not installed")
+            return None
+        
+        try:
+            catalogue = self.sfia_service.get_skill_catalogue()
+            if not catalogue:
+                raise RuntimeError("skill catalogue is empty")
+            
+            embeddings = self._create_embeddings()
+            matrix, scales = _quantize_rows(_normalize_rows(embeddings.embed_documents(
+                [f"{entry['name']}: {entry['description']}" for entry in catalogue]
+            )))
+            skills = [
+                {
+                    'code': entry['code'],
+                    'name': entry['name'],
+                    'category': entry['category'],
+                    'description': entry['description'][:200],
+                }
+                for entry in catalogue
+            ]
+            logger.info(f"✅ Skill embedding search enabled: {len(skills)} skills indexed")
+            return embeddings, matrix, scales, skills
+        except Exception as e:
+            logger.warning(f"⚠️ Skill embedding search disabled: {e}")
+            return None
+    
+    def _embedding_search(self, keywords: List[str], limit: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Match keywords to skills with one embedding call and one matrix product
+        
+        Args:
+            keywords: Normalized keywords
+            limit: Maximum skills per keyword
+            
+        Returns:
+            Dictionary of keyword -> matching skills, most similar first
+        """
+        embeddings, matrix, scales, skills = self.skill_index
+        scores = (_normalize_rows(embeddings.embed_documents(keywords)) @ matrix.T) * scales
+        min_score = float(os.getenv("SKILL_EMBEDDING_MIN_SCORE", "0.35"))
+        
+        limit = min(limit, len(skills))
+        top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        
+        results = {}
+        for row, keyword in enumerate(keywords):
+            ranked = sorted(top[row], key=lambda column: -scores[row, column])
+            results[keyword] = [skills[column] for column in ranked if scores[row, column] >= min_score]
+        return results
+    
+    def _create_semantic_cache(self, namespace: str, threshold: Optional[float] = None):
+        """
+        Create a semantic cache backed by the active provider's embeddings
+        
+        Enabled with SEMANTIC_CACHE_ENABLED=true; SEMANTIC_CACHE_THRESHOLD sets the
+        cosine similarity required for a hit (default 0.95).
+        
+        Args:
+            namespace: Cache namespace
+            threshold: Similarity required for a hit (overrides SEMANTIC_CACHE_THRESHOLD)
+        
+        Returns:
+            SemanticCache instance, or None when disabled or unavailable
+        """
+        if os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() != "true":
+            return None
+        
+        try:
+            cache = SemanticCache(
+                namespace,
+                self._create_embeddings(),
+                threshold=threshold or float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+                maxsize=int(os.getenv("SEMANTIC_CACHE_SIZE", "1000")),
+            )
+            logger.info(f"✅ Semantic cache enabled for {namespace}")
+            return cache
+        except Exception as e:
+            logger.warning(f"⚠️ Semantic cache disabled: {e}")
+            return None
     
     def _build_graph(self) -> StateGraph:
         """
@@ -146,121 +842,696 @@ class JobDescriptionEnhancer:
         workflow = StateGraph(EnhancementState)
         
         # Add nodes
-        workflow.add_node("extract_skills", self.extract_skills_node)
+        # I/O-bound nodes carry async variants so aenhance() never blocks the event loop
+        workflow.add_node("extract_skills", RunnableLambda(self.extract_skills_node, self.aextract_skills_node))
+        workflow.add_node("map_keyword", RunnableLambda(self.map_keyword_node, self.amap_keyword_node))
         workflow.add_node("map_to_sfia", self.map_to_sfia_node)
         workflow.add_node("set_skill_level", self.set_skill_level_node)
-        workflow.add_node("regenerate_jd", self.regenerate_jd_node)
+        workflow.add_node("regenerate_jd", RunnableLambda(self.regenerate_jd_node, self.aregenerate_jd_node))
         
         # Define edges
+        # Keywords fan out to parallel map_keyword branches that join at map_to_sfia
         workflow.set_entry_point("extract_skills")
-        workflow.add_edge("extract_skills", "map_to_sfia")
+        workflow.add_conditional_edges(
+            "extract_skills",
+            self._dispatch_keywords,
+            ["map_keyword", "map_to_sfia"]
+        )
+        workflow.add_edge("map_keyword", "map_to_sfia")
         workflow.add_edge("map_to_sfia", "set_skill_level")
         workflow.add_edge("set_skill_level", "regenerate_jd")
         workflow.add_edge("regenerate_jd", END)
         
         return workflow.compile()
     
-    def extract_skills_node(self, state: EnhancementState) -> EnhancementState:
+    def _build_creation_graph(self) -> StateGraph:
         """
-        Node 1: Extract skills and keywords from job description using Ollama LLM
+        Build the workflow for creating a JD from organizational context alone
+        
+        With no JD text there are no skills to extract, map or level, so only
+        node 4 runs.
+        
+        Returns:
+            Compiled StateGraph
+        """
+        workflow = StateGraph(EnhancementState)
+        workflow.add_node("regenerate_jd", RunnableLambda(self.regenerate_jd_node, self.aregenerate_jd_node))
+        workflow.set_entry_point("regenerate_jd")
+        workflow.add_edge("regenerate_jd", END)
+        return workflow.compile()
+    
+    def _graph_for(self, state: EnhancementState):
+        """Pick the compiled workflow for a request: JD creation or enhancement"""
+        return self.creation_graph if self._is_jd_creation(state) else self.graph
+    
+    def extract_skills_node(self, state: EnhancementState) -> Dict[str, Any]:
+        """
+        Node 1: Extract skills and keywords from job description using the LLM
         
         Args:
             state: Current workflow state
             
         Returns:
-            Updated state with extracted keywords
+            Partial state update with extracted keywords
         """
         logger.info("=== Node 1: Extracting Skills ===")
         
         job_description = state["job_description"]
+        update = {}
         
         try:
-            # Use Ollama LLM to extract skills
-            messages = [
-                SystemMessage(content=get_skill_extraction_prompt()),
-                HumanMessage(content=format_skill_extraction_user_prompt(job_description))
-            ]
+            # Keywords pre-extracted by enhance_batch skip the LLM
+            keywords = state["extracted_keywords"]
+            if not keywords:
+                # Fused and code modes yield more than keywords (the JD outline, the
+                # resolved skills), so only free-text extraction goes through the caches
+                if self._use_fused(state):
+                    keywords = self._extract_fused(state, update)
+                elif self.code_extractor is not None:
+                    keywords = self._extract_codes(job_description, update)
+                else:
+                    # Identical and near-duplicate JDs reuse previously extracted keywords
+                    keywords, jd_vector = self._lookup_cached_keywords(job_description)
+                    if keywords is None:
+                        keywords = self._extract_keywords_batched(job_description, update)
+                        self._cache_keywords(job_description, jd_vector, keywords)
             
-            response = self.llm.invoke(messages)
-            keywords_text = response.content.strip()
+            # Keywords that did not stream (cached or pre-extracted) are all known
+            # up front, so resolve them with one batched KG search
+            if not update.get("keyword_matches"):
+                update["keyword_matches"] = self._lookup_keywords(self._normalize_keywords(keywords))
             
-            # Parse comma-separated keywords and clean them
-            raw_keywords = [k.strip() for k in keywords_text.split(',') if k.strip()]
+            logger.info(f"Extracted {len(keywords)} keywords: {keywords}")
             
-            # Clean keywords - remove LLM artifacts and keep only valid skill names
-            import re
-            clean_keywords = []
-            for kw in raw_keywords:
-                # Remove any leading text like "Here are the skills:" etc.
-                if ':' in kw and len(kw.split(':')[0]) > len(kw.split(':')[1]):
-                    kw = kw.split(':')[-1].strip()
-                # Remove quotes
-                kw = kw.replace('"', '').replace("'", "").strip()
-                # Keep only reasonable length keywords (2-50 chars)
-                if 2 <= len(kw) <= 50:
-                    clean_keywords.append(kw)
+            update["extracted_keywords"] = keywords
+            update["messages"] = [f"Extracted {len(keywords)} skill keywords"]
             
-            keywords = clean_keywords[:20]  # Limit to 20 keywords
+        except Exception as e:
+            logger.error(f"Error in extract_skills_node: {str(e)}")
+            update["error"] = f"Skill extraction error: {str(e)}"
+            update["extracted_keywords"] = []
+        
+        return update
+    
+    async def aextract_skills_node(self, state: EnhancementState) -> Dict[str, Any]:
+        """
+        Async variant of extract_skills_node used by aenhance
+        
+        Args:
+            state: Current workflow state
+            
+        Returns:
+            Partial state update with extracted keywords
+        """
+        logger.info("=== Node 1: Extracting Skills ===")
+        
+        job_description = state["job_description"]
+        update = {}
+        
+        try:
+            # Keywords pre-extracted by enhance_batch skip the LLM
+            keywords = state["extracted_keywords"]
+            if not keywords:
+                if self._use_fused(state):
+                    keywords = await self._aextract_fused(state, update)
+                elif self.code_extractor is not None:
+                    keywords = await self._aextract_codes(job_description, update)
+                else:
+                    # Embedding the JD is a blocking provider call
+                    keywords, jd_vector = await asyncio.to_thread(self._lookup_cached_keywords, job_description)
+                    if keywords is None:
+                        keywords = await self._aextract_keywords_batched(job_description, update)
+                        await asyncio.to_thread(self._cache_keywords, job_description, jd_vector, keywords)
+            
+            if not update.get("keyword_matches"):
+                loop = asyncio.get_running_loop()
+                update["keyword_matches"] = await loop.run_in_executor(
+                    _KG_LOOKUP_EXECUTOR, self._lookup_keywords, self._normalize_keywords(keywords)
+                )
             
             logger.info(f"Extracted {len(keywords)} keywords: {keywords}")
             
-            state["extracted_keywords"] = keywords
-            state["messages"].append(f"Extracted {len(keywords)} skill keywords")
+            update["extracted_keywords"] = keywords
+            update["messages"] = [f"Extracted {len(keywords)} skill keywords"]
             
         except Exception as e:
-            logger.error(f"Error in extract_skills_node: {str(e)}")
-            state["error"] = f"Skill extraction error: {str(e)}"
-            state["extracted_keywords"] = []
+            logger.error(f"Error in aextract_skills_node: {str(e)}")
+            update["error"] = f"Skill extraction error: {str(e)}"
+            update["extracted_keywords"] = []
         
-        return state
+        return update
+    
+    def _keyword_cache_key(self, job_description: str) -> str:
+        """Content key for an extraction: model, prompt and JD text"""
+        payload = json.dumps({
+            "schema": _CACHE_SCHEMA,
+            "model": getattr(self.extraction_llm, "model_name", None) or getattr(self.extraction_llm, "model", ""),
+            "system": self._extraction_system_message().content,
+            "jd": job_description,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _lookup_cached_keywords(self, job_description: str):
+        """
+        Look up previously extracted keywords for an identical or near-duplicate JD
+        
+        Returns:
+            Tuple of (cached keywords or None, JD vector for caching a fresh result or None)
+        """
+        if self.keyword_cache is not None:
+            cached_keywords = self.keyword_cache.get(self._keyword_cache_key(job_description))
+            if cached_keywords is not None:
+                logger.info("Extraction cache hit - reusing extracted keywords")
+                return cached_keywords, None
+        
+        if self.extraction_cache is None:
+            return None, None
+        
+        try:
+            cached_keywords, jd_vector = self.extraction_cache.lookup(job_description)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None, None
+        
+        if cached_keywords is not None:
+            logger.info("Semantic cache hit - reusing extracted keywords")
+        return cached_keywords, jd_vector
+    
+    def _cache_keywords(self, job_description: str, jd_vector, keywords: List[str]) -> None:
+        """
+        Store freshly extracted keywords in the extraction caches
+        
+        Args:
+            job_description: Job description text
+            jd_vector: JD embedding from _lookup_cached_keywords (None when semantic caching is off)
+            keywords: Extracted keywords (empty results are not cached)
+        """
+        if not keywords:
+            return
+        if self.keyword_cache is not None:
+            self.keyword_cache.set(self._keyword_cache_key(job_description), keywords)
+        if jd_vector is not None:
+            self.extraction_cache.add(jd_vector, keywords)
+    
+    def _extract_keywords(self, job_description: str, update: Dict[str, Any]) -> List[str]:
+        """
+        Extract keywords with the LLM, starting KG lookups while the response streams
+        
+        Args:
+            job_description: Job description text
+            update: Node 1's partial state update (receives the completed keyword_matches)
+            
+        Returns:
+            Cleaned keywords (at most 20)
+        """
+        messages = self._extraction_messages(job_description)
+        
+        # Stream the response and start a KG lookup for each keyword as soon as it is complete
+        lookups = {}
+        if self.skill_extractor is not None:
+            raw_keywords = self._stream_structured_keywords(messages, lookups)
+        else:
+            raw_keywords = self._stream_text_keywords(messages, lookups)
+        
+        keywords = self._finalize_keywords(raw_keywords)
+        
+        # Collect the lookups started while streaming so the fan-out can skip them
+        update["keyword_matches"] = [
+            lookups[keyword].result()
+            for keyword in self._normalize_keywords(keywords)
+            if keyword in lookups
+        ]
+        
+        return keywords
+    
+    async def _aextract_keywords(self, job_description: str, update: Dict[str, Any]) -> List[str]:
+        """
+        Async variant of _extract_keywords
+        
+        Args:
+            job_description: Job description text
+            update: Node 1's partial state update (receives the completed keyword_matches)
+            
+        Returns:
+            Cleaned keywords (at most 20)
+        """
+        messages = self._extraction_messages(job_description)
+        
+        lookups = {}
+        if self.skill_extractor is not None:
+            raw_keywords = await self._astream_structured_keywords(messages, lookups)
+        else:
+            raw_keywords = await self._astream_text_keywords(messages, lookups)
+        
+        keywords = self._finalize_keywords(raw_keywords)
+        
+        update["keyword_matches"] = [
+            await asyncio.wrap_future(lookups[keyword])
+            for keyword in self._normalize_keywords(keywords)
+            if keyword in lookups
+        ]
+        
+        return keywords
+    
+    def _use_fused(self, state: EnhancementState) -> bool:
+        """Whether to extract and rewrite in one call (needs an existing JD to rewrite)"""
+        return self.fused_enhancer is not None and bool(state["job_description"].strip())
+    
+    def _fused_messages(self, state: EnhancementState) -> List:
+        """Build the fused extraction + rewrite prompt messages"""
+        return [
+            _FUSED_ENHANCEMENT_SYSTEM_MESSAGE,
+            HumanMessage(content=format_fused_enhancement_user_prompt(
+                state["job_description"], state.get("org_context", {})
+            ))
+        ]
     
-    def map_to_sfia_node(self, state: EnhancementState) -> EnhancementState:
+    def _extract_fused(self, state: EnhancementState, update: Dict[str, Any]) -> List[str]:
         """
-        Node 2: Map extracted keywords to SFIA skills using knowledge graph
+        Extract keywords and rewrite the JD with a single LLM call
         
         Args:
             state: Current workflow state
+            update: Node 1's partial state update (receives the JD outline for node 4)
             
         Returns:
-            Updated state with mapped SFIA skills
+            Cleaned keywords (at most 20)
         """
-        logger.info("=== Node 2: Mapping to SFIA Skills ===")
+        result = self.fused_enhancer.invoke(self._fused_messages(state))
+        update["jd_outline"] = result.jd_outline.strip()
+        return self._finalize_keywords(result.skills)
+    
+    async def _aextract_fused(self, state: EnhancementState, update: Dict[str, Any]) -> List[str]:
+        """Async variant of _extract_fused"""
+        result = await self.fused_enhancer.ainvoke(self._fused_messages(state))
+        update["jd_outline"] = result.jd_outline.strip()
+        return self._finalize_keywords(result.skills)
+    
+    def _code_extraction_messages(self, job_description: str) -> List:
+        """Build the direct SFIA code extraction prompt messages"""
+        return [
+            self._code_extraction_system_message,
+            HumanMessage(content=format_skill_extraction_user_prompt(job_description))
+        ]
+    
+    def _extract_codes(self, job_description: str, update: Dict[str, Any]) -> List[str]:
+        """
+        Pick SFIA skills for a JD with a single LLM call over the skill catalogue
         
-        keywords = state["extracted_keywords"]
-        sfia_skills = []
-        seen_codes = set()
+        Args:
+            job_description: Job description text
+            update: Node 1's partial state update (receives the resolved keyword_matches)
+            
+        Returns:
+            Names of the picked skills (at most 20), used as the extracted keywords
+        """
+        result = self.code_extractor.invoke(self._code_extraction_messages(job_description))
+        return self._apply_codes(result.codes, update)
+    
+    async def _aextract_codes(self, job_description: str, update: Dict[str, Any]) -> List[str]:
+        """Async variant of _extract_codes"""
+        result = await self.code_extractor.ainvoke(self._code_extraction_messages(job_description))
+        return self._apply_codes(result.codes, update)
+    
+    def _apply_codes(self, codes: List[str], update: Dict[str, Any]) -> List[str]:
+        """Turn picked codes into keyword matches, dropping codes not in the catalogue"""
+        picked = dict.fromkeys(code.strip().upper() for code in codes)
+        skills = [self._skills_by_code[code] for code in picked if code in self._skills_by_code][:20]
+        
+        update["keyword_matches"] = [
+            {"index": index, "keyword": _normalize_keyword(skill['name']), "results": [skill], "error": ""}
+            for index, skill in enumerate(skills)
+        ]
+        return [skill['name'] for skill in skills]
+    
+    def _extract_keywords_batch(self, job_descriptions: List[str]) -> List[List[str]]:
+        """
+        Extract keywords for several JDs with a single structured LLM call
+        
+        Args:
+            job_descriptions: Job description texts
+            
+        Returns:
+            Cleaned keywords per JD, in input order; None for JDs the response
+            did not cover (or for every JD when structured output is unavailable)
+        """
+        if self.batch_skill_extractor is None:
+            return [None] * len(job_descriptions)
+        
+        messages = [
+            _BATCH_EXTRACTION_SYSTEM_MESSAGE,
+            HumanMessage(content=format_batch_skill_extraction_user_prompt(job_descriptions))
+        ]
+        response = self.batch_skill_extractor.invoke(messages)
+        
+        keywords_by_id = {
+            result.jd_id: self._finalize_keywords(result.skills)
+            for result in response.results
+            if 0 <= result.jd_id < len(job_descriptions)
+        }
+        return [keywords_by_id.get(jd_id) or None for jd_id in range(len(job_descriptions))]
+    
+    def _extract_keywords_batched(self, job_description: str, update: Dict[str, Any]) -> List[str]:
+        """
+        Extract keywords, packing them into a shared LLM call with concurrent requests
+        
+        Args:
+            job_description: Job description text
+            update: Node 1's partial state update (receives streamed keyword_matches)
+            
+        Returns:
+            Cleaned keywords
+        """
+        if self.extraction_batcher is None:
+            return self._extract_keywords(job_description, update)
         
         try:
-            for keyword in keywords:
-                # Search Knowledge Graph directly by keyword
-                results = self.sfia_service.search_skills(keyword, limit=3)
-                
-                for skill in results:
-                    code = skill.get('code', '')
-                    if code and code not in seen_codes:
-                        seen_codes.add(code)
-                        sfia_skills.append({
-                            'code': code,
-                            'label': skill.get('name', ''),
-                            'category': skill.get('category', ''),
-                            'description': skill.get('description', ''),
-                            'keyword_matched': keyword
-                        })
-                        logger.info(f"   ✓ Matched '{keyword}' → {code}: {skill.get('name', '')}")
-            
-            logger.info(f"Mapped to {len(sfia_skills)} SFIA skills")
-            
-            state["sfia_skills"] = sfia_skills
-            state["messages"].append(f"Mapped to {len(sfia_skills)} SFIA skills via Knowledge Graph")
+            future = self.extraction_batcher.submit(job_description)
+            keywords = future.result() if future is not None else None
+            if keywords is None:
+                keywords = self._extract_keywords(job_description, update)
+            return keywords
+        finally:
+            self.extraction_batcher.done()
+    
+    async def _aextract_keywords_batched(self, job_description: str, update: Dict[str, Any]) -> List[str]:
+        """Async variant of _extract_keywords_batched"""
+        if self.extraction_batcher is None:
+            return await self._aextract_keywords(job_description, update)
+        
+        try:
+            # submit() runs a full batch's LLM call inline, so keep it off the event loop
+            future = await asyncio.to_thread(self.extraction_batcher.submit, job_description)
+            keywords = await asyncio.wrap_future(future) if future is not None else None
+            if keywords is None:
+                keywords = await self._aextract_keywords(job_description, update)
+            return keywords
+        finally:
+            self.extraction_batcher.done()
+    
+    def _extraction_system_message(self) -> SystemMessage:
+        """
+        Get the extraction system message for the active response format
+        
+        The comma-separated instruction would push a structured response into a
+        single list item, so structured extraction uses its own prompt.
+        """
+        if self.skill_extractor is not None:
+            return _STRUCTURED_EXTRACTION_SYSTEM_MESSAGE
+        return _TEXT_EXTRACTION_SYSTEM_MESSAGE
+    
+    def _extraction_messages(self, job_description: str) -> List:
+        """Build the skill extraction prompt messages"""
+        return [
+            self._extraction_system_message(),
+            HumanMessage(content=format_skill_extraction_user_prompt(job_description))
+        ]
+    
+    def _finalize_keywords(self, raw_keywords: List[str]) -> List[str]:
+        """
+        Clean raw keywords, drop LLM artifacts and near-duplicates, and limit to 20
+        
+        The first spelling of each normalized keyword is kept for display.
+        """
+        unique_keywords = {}
+        for raw in raw_keywords:
+            kw = self._clean_keyword(raw)
+            normalized = _normalize_keyword(kw) if kw else ""
+            if normalized:
+                unique_keywords.setdefault(normalized, kw)
+        return list(unique_keywords.values())[:20]
+    
+    def _stream_structured_keywords(self, messages: List, lookups: Dict[str, Any]) -> List[str]:
+        """
+        Stream a structured SkillList response, starting lookups for completed items
+        
+        Returns:
+            Raw skill keywords from the final response
+        """
+        skills = []
+        for partial in self.skill_extractor.stream(messages):
+            skills = self._on_structured_partial(partial, skills, lookups)
+        
+        for raw in skills:
+            self._start_keyword_lookup(raw, lookups)
+        return skills
+    
+    async def _astream_structured_keywords(self, messages: List, lookups: Dict[str, Any]) -> List[str]:
+        """Async variant of _stream_structured_keywords"""
+        skills = []
+        async for partial in self.skill_extractor.astream(messages):
+            skills = self._on_structured_partial(partial, skills, lookups)
+        
+        for raw in skills:
+            self._start_keyword_lookup(raw, lookups)
+        return skills
+    
+    def _on_structured_partial(self, partial, skills: List[str], lookups: Dict[str, Any]) -> List[str]:
+        """
+        Start lookups for the completed items of a partial SkillList
+        
+        Returns:
+            Skills parsed so far
+        """
+        if partial is None:
+            return skills
+        # The last item may still be streaming
+        for raw in partial.skills[:-1]:
+            self._start_keyword_lookup(raw, lookups)
+        return partial.skills
+    
+    def _stream_text_keywords(self, messages: List, lookups: Dict[str, Any]) -> List[str]:
+        """
+        Stream a comma-separated response, starting lookups as each comma arrives
+        
+        Returns:
+            Raw comma-separated items from the final response
+        """
+        parts = []
+        pending = ""
+        for chunk in self.extraction_llm.stream(messages):
+            parts.append(chunk.content)
+            pending = self._on_text_chunk(pending + chunk.content, lookups)
+        self._start_keyword_lookup(pending, lookups)
+        
+        return ''.join(parts).strip().split(',')
+    
+    async def _astream_text_keywords(self, messages: List, lookups: Dict[str, Any]) -> List[str]:
+        """Async variant of _stream_text_keywords"""
+        parts = []
+        pending = ""
+        async for chunk in self.extraction_llm.astream(messages):
+            parts.append(chunk.content)
+            pending = self._on_text_chunk(pending + chunk.content, lookups)
+        self._start_keyword_lookup(pending, lookups)
+        
+        return ''.join(parts).strip().split(',')
+    
+    def _on_text_chunk(self, pending: str, lookups: Dict[str, Any]) -> str:
+        """
+        Start lookups for every comma-terminated item in the streamed text
+        
+        Returns:
+            Trailing text that may still be streaming
+        """
+        if ',' in pending:
+            *complete, pending = pending.split(',')
+            for raw in complete:
+                self._start_keyword_lookup(raw, lookups)
+        return pending
+    
+    def _clean_keyword(self, raw: str) -> str:
+        """
+        Clean a raw keyword - remove LLM artifacts and keep only valid skill names
+        
+        Returns:
+            Cleaned keyword, or None if it should be discarded
+        """
+        kw = raw.strip()
+        # Remove any leading text like "Here are the skills:" etc. (split once, not per check)
+        if ':' in kw:
+            parts = kw.split(':')
+            if len(parts[0]) > len(parts[1]):
+                kw = parts[-1].strip()
+        # Remove quotes
+        kw = kw.translate(_QUOTE_TABLE).strip()
+        # Keep only reasonable length keywords (2-50 chars)
+        return kw if 2 <= len(kw) <= 50 else None
+    
+    def _start_keyword_lookup(self, raw: str, lookups: Dict[str, Any]) -> None:
+        """
+        Submit a background KG lookup for a streamed keyword
+        
+        Args:
+            raw: Raw keyword text from the LLM stream
+            lookups: Futures keyed by normalized keyword, in first-seen order
+        """
+        keyword = self._clean_keyword(raw)
+        if not keyword or len(lookups) >= 20:
+            return
+        
+        keyword = _normalize_keyword(keyword)
+        if keyword and keyword not in lookups:
+            lookups[keyword] = _KG_LOOKUP_EXECUTOR.submit(self._lookup_keyword, keyword, len(lookups))
+    
+    def _lookup_keyword(self, keyword: str, index: int) -> Dict[str, Any]:
+        """
+        Search the knowledge graph for a single normalized keyword
+        
+        Returns:
+            Match record with the keyword's position, results and any error
+        """
+        match = {"index": index, "keyword": keyword, "results": [], "error": ""}
+        if not _is_searchable_keyword(keyword):
+            return match
+        
+        try:
+            if self.skill_index is not None:
+                try:
+                    match["results"] = self._embedding_search([keyword])[keyword]
+                    return match
+                except Exception as e:
+                    logger.warning(f"Embedding search failed for '{keyword}', using the KG: {e}")
             
+            # Search Knowledge Graph directly by keyword
+            match["results"] = self.sfia_service.search_skills(keyword, limit=3)
         except Exception as e:
-            logger.error(f"Error in map_to_sfia_node: {str(e)}")
-            state["error"] = f"SFIA mapping error: {str(e)}"
-            state["sfia_skills"] = []
+            logger.error(f"Error mapping keyword '{keyword}': {str(e)}")
+            match["error"] = str(e)
         
-        return state
+        return match
+    
+    def _lookup_keywords(self, keywords: List[str]) -> List[Dict[str, Any]]:
+        """
+        Search the knowledge graph for several normalized keywords in one batch
+        
+        Returns:
+            Match records in keyword order (see _lookup_keyword)
+        """
+        if not keywords:
+            return []
+        
+        error = ""
+        searchable = [keyword for keyword in keywords if _is_searchable_keyword(keyword)]
+        try:
+            results = None
+            if self.skill_index is not None and searchable:
+                try:
+                    results = self._embedding_search(searchable)
+                except Exception as e:
+                    logger.warning(f"Embedding search failed, using the KG: {e}")
+            if results is None:
+                results = self.sfia_service.search_skills_batch(searchable, limit=3) if searchable else {}
+        except Exception as e:
+            logger.error(f"Error mapping keywords: {str(e)}")
+            results, error = {}, str(e)
+        
+        return [
+            {"index": index, "keyword": keyword, "results": results.get(keyword, []), "error": error}
+            for index, keyword in enumerate(keywords)
+        ]
+    
+    def _dispatch_keywords(self, state: EnhancementState):
+        """
+        Fan out one map_keyword branch per normalized keyword not already
+        resolved by the extraction node
+        
+        Args:
+            state: Current workflow state
+            
+        Returns:
+            List of Send packets, or "map_to_sfia" when nothing is left to look up
+        """
+        keywords = self._normalize_keywords(state["extracted_keywords"])
+        resolved = {match["keyword"] for match in state.get("keyword_matches", [])}
+        
+        sends = [
+            Send("map_keyword", {"keyword": keyword, "index": index})
+            for index, keyword in enumerate(keywords)
+            if keyword not in resolved
+        ]
+        return sends or "map_to_sfia"
     
-    def set_skill_level_node(self, state: EnhancementState) -> EnhancementState:
+    def map_keyword_node(self, branch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Node 2a: Search the knowledge graph for a single keyword (runs in parallel per keyword)
+        
+        Args:
+            branch: Send payload with the keyword and its position in the keyword list
+            
+        Returns:
+            Partial state update appending this keyword's matches
+        """
+        match = self._lookup_keyword(branch["keyword"], branch["index"])
+        return {"keyword_matches": [match]}
+    
+    async def amap_keyword_node(self, branch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of map_keyword_node; the SPARQL client is blocking, so the
+        lookup runs on the shared KG lookup pool
+        
+        Args:
+            branch: Send payload with the keyword and its position in the keyword list
+            
+        Returns:
+            Partial state update appending this keyword's matches
+        """
+        loop = asyncio.get_running_loop()
+        match = await loop.run_in_executor(
+            _KG_LOOKUP_EXECUTOR, self._lookup_keyword, branch["keyword"], branch["index"]
+        )
+        return {"keyword_matches": [match]}
+    
+    def map_to_sfia_node(self, state: EnhancementState) -> Dict[str, Any]:
+        """
+        Node 2b: Join per-keyword knowledge graph matches into a de-duplicated skill list
+        
+        Args:
+            state: Current workflow state
+            
+        Returns:
+            Partial state update with mapped SFIA skills
+        """
+        logger.info("=== Node 2: Mapping to SFIA Skills ===")
+        
+        # Insertion-ordered by code, so the first keyword to match a code claims it
+        sfia_by_code = {}
+        errors = []
+        
+        # Branches finish in any order; keyword order decides which keyword claims a code
+        for match in sorted(state.get("keyword_matches", []), key=lambda m: m["index"]):
+            keyword = match["keyword"]
+            if match["error"]:
+                errors.append(f"{keyword}: {match['error']}")
+            
+            new_codes = []
+            for skill in match["results"]:
+                code = skill.get('code')
+                if code and code not in sfia_by_code:
+                    sfia_by_code[code] = {
+                        'code': code,
+                        'label': skill.get('name', ''),
+                        'category': skill.get('category', ''),
+                        'description': skill.get('description', ''),
+                        'keyword_matched': keyword
+                    }
+                    new_codes.append(code)
+            
+            if new_codes and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   ✓ Matched '{keyword}' → {', '.join(new_codes)}")
+        
+        sfia_skills = list(sfia_by_code.values())
+        logger.info(f"Mapped to {len(sfia_skills)} SFIA skills")
+        
+        update = {
+            "sfia_skills": sfia_skills,
+            "messages": [f"Mapped to {len(sfia_skills)} SFIA skills via Knowledge Graph"]
+        }
+        if errors:
+            update["error"] = f"SFIA mapping error: {'; '.join(errors)}"
+        return update
+    
+    def set_skill_level_node(self, state: EnhancementState) -> Dict[str, Any]:
         """
         Node 3: Determine appropriate skill levels based on job description context
         
@@ -268,7 +1539,7 @@ class JobDescriptionEnhancer:
             state: Current workflow state
             
         Returns:
-            Updated state with skill levels assigned
+            Partial state update with skill levels assigned
         """
         logger.info("=== Node 3: Setting Skill Levels ===")
         
@@ -277,23 +1548,37 @@ class JobDescriptionEnhancer:
         enhanced_skills = []
         
         try:
+            # Scan the JD once for seniority detection and level assignment
+            indicators = _scan_indicators(job_description.lower())
+            
             # Detect seniority indicators in job description
-            seniority_level = self._detect_seniority(job_description.lower())
+            seniority_level = self._detect_seniority(indicators)
             
             logger.info(f"Detected seniority level: {seniority_level}")
             
+            # Level depends only on the JD, not the skill, so assign it once
+            assigned_level = self._assign_level(seniority_level, indicators)
+            level_name = self._get_level_name(assigned_level)
+            
+            # Level descriptions come from the preloaded map; only codes missing
+            # from it (e.g. if the preload failed) are fetched in one KG query
+            skill_levels = {
+                skill['code']: self._levels_cache[skill['code']]
+                for skill in sfia_skills if skill['code'] in self._levels_cache
+            }
+            missing_codes = [skill['code'] for skill in sfia_skills if skill['code'] not in skill_levels]
+            if missing_codes:
+                skill_levels.update(self.sfia_service.get_skill_levels_detail_batch(missing_codes))
+            
             for skill in sfia_skills:
                 skill_code = skill['code']
                 
-                # Determine appropriate level based on seniority
-                assigned_level = self._assign_level(
-                    seniority_level,
-                    skill_code,
-                    job_description
-                )
-                
                 # Get level-specific description from Knowledge Graph
-                level_description = self._get_level_description(skill_code, assigned_level)
+                level_description = self._get_level_description(
+                    skill_code,
+                    assigned_level,
+                    levels=skill_levels.get(skill_code, {})
+                )
                 
                 enhanced_skill = {
                     'code': skill['code'],
@@ -301,26 +1586,29 @@ class JobDescriptionEnhancer:
                     'category': skill.get('category', ''),
                     'description': skill.get('description', ''),  # Skill definition
                     'level': assigned_level,
-                    'level_name': self._get_level_name(assigned_level),
+                    'level_name': level_name,
                     'level_description': level_description,
                     'keyword_matched': skill.get('keyword_matched', '')
                 }
                 
                 enhanced_skills.append(enhanced_skill)
-                logger.info(f"   Set {skill['code']} → Level {assigned_level} ({self._get_level_name(assigned_level)})")
             
-            state["enhanced_skills"] = enhanced_skills
-            state["messages"].append(f"Assigned levels to {len(enhanced_skills)} skills")
-            state["kg_connected"] = self.kg_connected
+            logger.info(f"   Set {len(enhanced_skills)} skills → Level {assigned_level} ({level_name})")
+            
+            return {
+                "enhanced_skills": enhanced_skills,
+                "messages": [f"Assigned levels to {len(enhanced_skills)} skills"],
+                "kg_connected": self.kg_connected
+            }
             
         except Exception as e:
             logger.error(f"Error in set_skill_level_node: {str(e)}")
-            state["error"] = f"Level assignment error: {str(e)}"
-            state["enhanced_skills"] = []
-        
-        return state
+            return {
+                "error": f"Level assignment error: {str(e)}",
+                "enhanced_skills": []
+            }
     
-    def regenerate_jd_node(self, state: EnhancementState) -> EnhancementState:
+    def regenerate_jd_node(self, state: EnhancementState) -> Dict[str, Any]:
         """
         Node 4: Regenerate job description incorporating SFIA skills
         Or create JD from scratch if no existing JD provided
@@ -329,117 +1617,227 @@ class JobDescriptionEnhancer:
             state: Current workflow state
             
         Returns:
-            Updated state with regenerated job description
+            Partial state update with regenerated job description
+        """
+        logger.info("=== Node 4: Regenerating Job Description ===")
+        
+        update = {}
+        
+        # Fused extraction already wrote the JD; only the competency section is missing
+        if state.get("jd_outline"):
+            self._apply_regenerated_jd(state, update, fill_jd_outline(state["jd_outline"], state["enhanced_skills"]))
+            return update
+        
+        messages = self._regeneration_messages(state, update)
+        if messages is None:
+            return update
+        
+        try:
+            jd_text, cache_key, prompt_vector = self._lookup_regenerated_jd(messages)
+            if jd_text is None:
+                # Streamed so token events reach stream_enhance as they are generated
+                llm = _with_max_tokens(self.llm, self._regeneration_token_budget(state))
+                jd_text = "".join(chunk.content for chunk in llm.stream(messages)).strip()
+                self._cache_regenerated_jd(messages, cache_key, prompt_vector, jd_text)
+            self._apply_regenerated_jd(state, update, jd_text)
+        except Exception as e:
+            self._apply_regeneration_error(state, update, e)
+        
+        return update
+    
+    async def aregenerate_jd_node(self, state: EnhancementState) -> Dict[str, Any]:
+        """
+        Async variant of regenerate_jd_node used by aenhance
+        
+        Args:
+            state: Current workflow state
+            
+        Returns:
+            Partial state update with regenerated job description
         """
         logger.info("=== Node 4: Regenerating Job Description ===")
         
+        update = {}
+        
+        # Fused extraction already wrote the JD; only the competency section is missing
+        if state.get("jd_outline"):
+            self._apply_regenerated_jd(state, update, fill_jd_outline(state["jd_outline"], state["enhanced_skills"]))
+            return update
+        
+        messages = self._regeneration_messages(state, update)
+        if messages is None:
+            return update
+        
+        try:
+            jd_text, cache_key, prompt_vector = self._lookup_regenerated_jd(messages)
+            if jd_text is None:
+                llm = _with_max_tokens(self.llm, self._regeneration_token_budget(state))
+                jd_text = "".join([chunk.content async for chunk in llm.astream(messages)]).strip()
+                self._cache_regenerated_jd(messages, cache_key, prompt_vector, jd_text)
+            self._apply_regenerated_jd(state, update, jd_text)
+        except Exception as e:
+            self._apply_regeneration_error(state, update, e)
+        
+        return update
+    
+    def _is_jd_creation(self, state: EnhancementState) -> bool:
+        """Whether node 4 creates a JD from organizational context rather than rewriting one"""
+        return not state["job_description"].strip() and bool(state.get("org_context", {}))
+    
+    def _regeneration_token_budget(self, state: EnhancementState) -> int:
+        """Output token cap for node 4, so short JDs do not reserve the full budget"""
+        if self._is_jd_creation(state):
+            return _creation_token_budget(state.get("org_context", {}))
+        return _rewrite_token_budget(state["job_description"], len(state["enhanced_skills"]))
+    
+    def _regeneration_messages(self, state: EnhancementState, update: Dict[str, Any]):
+        """
+        Build the prompt messages for node 4
+        
+        Returns:
+            Prompt messages, or None when there is nothing to regenerate
+            (the original JD is kept and recorded in update)
+        """
         job_description = state["job_description"]
         enhanced_skills = state["enhanced_skills"]
         org_context = state.get("org_context", {})
         
         # If no existing JD and we have org_context, CREATE a new JD from scratch
-        if not job_description.strip() and org_context:
+        if self._is_jd_creation(state):
             logger.info("No existing JD - creating from organizational context")
-            try:
-                messages = [
-                    SystemMessage(content=get_jd_creation_system_prompt()),
-                    HumanMessage(content=format_jd_creation_user_prompt(org_context))
-                ]
-                
-                response = self.llm.invoke(messages)
-                created_jd = response.content.strip()
-                
-                logger.info(f"Created JD from context: {len(created_jd)} characters")
-                
-                state["regenerated_jd"] = created_jd
-                state["messages"].append("Created JD from organizational context")
-                return state
-                
-            except Exception as e:
-                logger.error(f"Error creating JD from context: {str(e)}")
-                state["error"] = f"JD creation error: {str(e)}"
-                state["regenerated_jd"] = ""
-                return state
+            return [
+                _JD_CREATION_SYSTEM_MESSAGE,
+                HumanMessage(content=format_jd_creation_user_prompt(org_context))
+            ]
         
         # If no SFIA skills but we have an existing JD, return original
         if not enhanced_skills:
             logger.info("No SFIA skills to incorporate, using original JD")
-            state["regenerated_jd"] = job_description
-            state["messages"].append("No SFIA skills found to incorporate")
-            return state
+            update["regenerated_jd"] = job_description
+            update["messages"] = ["No SFIA skills found to incorporate"]
+            return None
         
-        try:
-            # Format skills with detailed descriptions for better LLM context
-            skills_text = format_skills_detailed(enhanced_skills)
-            
-            # Include organizational context if provided
-            messages = [
-                SystemMessage(content=get_jd_regeneration_system_prompt()),
-                HumanMessage(content=format_jd_regeneration_user_prompt(job_description, skills_text, org_context))
-            ]
-            
-            response = self.llm.invoke(messages)
-            regenerated_jd = response.content.strip()
-            
-            logger.info(f"Regenerated JD: {len(regenerated_jd)} characters")
-            
-            state["regenerated_jd"] = regenerated_jd
-            state["messages"].append(f"Regenerated JD with {len(enhanced_skills)} SFIA skills")
+        # Format skills with detailed descriptions for better LLM context
+        skills_text = format_skills_detailed(enhanced_skills)
+        
+        # Include organizational context if provided
+        return [
+            _JD_REGENERATION_SYSTEM_MESSAGE,
+            HumanMessage(content=format_jd_regeneration_user_prompt(job_description, skills_text, org_context))
+        ]
+    
+    def _regeneration_cache_key(self, messages: List):
+        """
+        Content key for a regeneration: model, temperature and prompt messages
+        
+        Returns:
+            Cache key, or None when regeneration caching is off
+        """
+        if self.regeneration_cache is None:
+            return None
+        return _prompt_cache_key(self.llm, messages)
+    
+    def _lookup_regenerated_jd(self, messages: List):
+        """
+        Look up a cached JD for node 4's prompt: exact match first, then near-duplicates
+        
+        Args:
+            messages: Node 4 prompt messages
             
+        Returns:
+            Tuple of (cached JD or None, exact cache key or None, prompt vector for
+            caching a fresh result or None)
+        """
+        cache_key = self._regeneration_cache_key(messages)
+        if cache_key is None:
+            return None, None, None
+        
+        jd_text = self.regeneration_cache.get(cache_key)
+        if jd_text is not None:
+            return jd_text, cache_key, None
+        
+        semantic_cache = self.regeneration_semantic_caches.get(messages[0].content)
+        if semantic_cache is None:
+            return None, cache_key, None
+        
+        try:
+            jd_text, prompt_vector = semantic_cache.lookup(messages[-1].content)
         except Exception as e:
-            logger.error(f"Error in regenerate_jd_node: {str(e)}")
-            state["error"] = f"JD regeneration error: {str(e)}"
-            state["regenerated_jd"] = job_description  # Fallback to original
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None, cache_key, None
         
-        return state
+        if jd_text is not None:
+            logger.info("Semantic cache hit - reusing regenerated JD")
+        return jd_text, cache_key, prompt_vector
+    
+    def _cache_regenerated_jd(self, messages: List, cache_key, prompt_vector, jd_text: str) -> None:
+        """Store a freshly written JD in the regeneration caches (empty responses are not cached)"""
+        if not cache_key or not jd_text:
+            return
+        self.regeneration_cache.set(cache_key, jd_text)
+        if prompt_vector is not None:
+            self.regeneration_semantic_caches[messages[0].content].add(prompt_vector, jd_text)
+    
+    def _apply_regenerated_jd(self, state: EnhancementState, update: Dict[str, Any], jd_text: str) -> None:
+        """Record the LLM-written job description in node 4's update"""
+        update["regenerated_jd"] = jd_text
+        
+        if self._is_jd_creation(state):
+            logger.info(f"Created JD from context: {len(jd_text)} characters")
+            update["messages"] = ["Created JD from organizational context"]
+        else:
+            logger.info(f"Regenerated JD: {len(jd_text)} characters")
+            update["messages"] = [f"Regenerated JD with {len(state['enhanced_skills'])} SFIA skills"]
+    
+    def _apply_regeneration_error(self, state: EnhancementState, update: Dict[str, Any], error: Exception) -> None:
+        """Record a node 4 LLM failure in node 4's update"""
+        if self._is_jd_creation(state):
+            logger.error(f"Error creating JD from context: {str(error)}")
+            update["error"] = f"JD creation error: {str(error)}"
+            update["regenerated_jd"] = ""
+        else:
+            logger.error(f"Error in regenerate_jd_node: {str(error)}")
+            update["error"] = f"JD regeneration error: {str(error)}"
+            update["regenerated_jd"] = state["job_description"]  # Fallback to original
+    
+    def _normalize_keywords(self, keywords: List[str]) -> List[str]:
+        """
+        Normalize and de-duplicate keywords, preserving first-seen order
+        so near-duplicates ("Python", "python ", "Python developer") trigger
+        a single KG lookup
+        """
+        normalized = (_normalize_keyword(k) for k in keywords)
+        return list(dict.fromkeys(k for k in normalized if k))
     
     def _get_level_name(self, level: int) -> str:
         """Get the SFIA level name"""
-        level_names = {
-            1: "Follow",
-            2: "Assist",
-            3: "Apply",
-            4: "Enable",
-            5: "Ensure/Advise",
-            6: "Initiate/Influence",
-            7: "Set Strategy/Inspire/Mobilise"
-        }
-        return level_names.get(level, f"Level {level}")
+        return _LEVEL_NAMES.get(level, f"Level {level}")
     
-    def _detect_seniority(self, text: str) -> str:
+    def _detect_seniority(self, found: frozenset) -> str:
         """
-        Detect seniority level from job description text
+        Detect seniority level from the job description's indicator categories
+        
+        Args:
+            found: Indicator categories from _scan_indicators
         
         Returns:
             'junior', 'mid', 'senior', or 'lead'
         """
-        # Seniority indicators
-        junior_indicators = ['junior', 'entry', 'graduate', '0-2 years', 'beginner']
-        mid_indicators = ['mid-level', 'intermediate', '3-5 years', 'experienced']
-        senior_indicators = ['senior', 'principal', '5+ years', 'expert', '7+ years']
-        lead_indicators = ['lead', 'architect', 'manager', 'head', 'director', 'principal']
-        
-        # Count matches
-        lead_count = sum(1 for indicator in lead_indicators if indicator in text)
-        senior_count = sum(1 for indicator in senior_indicators if indicator in text)
-        mid_count = sum(1 for indicator in mid_indicators if indicator in text)
-        junior_count = sum(1 for indicator in junior_indicators if indicator in text)
-        
-        # Determine seniority based on counts
-        if lead_count > 0:
+        # Determine seniority by category priority
+        if 'lead' in found:
             return 'lead'
-        elif senior_count > 0:
+        elif 'senior' in found:
             return 'senior'
-        elif mid_count > 0:
+        elif 'mid' in found:
             return 'mid'
-        elif junior_count > 0:
+        elif 'junior' in found:
             return 'junior'
         else:
             return 'mid'  # Default to mid-level
     
-    def _assign_level(self, seniority: str, skill_code: str, job_description: str) -> int:
+    def _assign_level(self, seniority: str, found: frozenset) -> int:
         """
-        Assign SFIA level (1-7) based on seniority
+        Assign SFIA level (1-7) based on seniority and JD-wide context
         
         SFIA Levels:
         1: Follow - Basic understanding
@@ -449,36 +1847,38 @@ class JobDescriptionEnhancer:
         5: Ensure - Expert, ensures quality
         6: Initiate - Senior expert, strategic
         7: Set strategy - Leader, enterprise-wide
+        
+        Args:
+            seniority: Seniority from _detect_seniority
+            found: Indicator categories from _scan_indicators
         """
         # Base level mapping
-        level_mapping = {
-            'junior': 2,
-            'mid': 4,
-            'senior': 5,
-            'lead': 6
-        }
-        
-        base_level = level_mapping.get(seniority, 4)
-        
-        # Adjust based on context in job description
-        jd_lower = job_description.lower()
+        base_level = _SENIORITY_BASE_LEVELS.get(seniority, 4)
         
         # Leadership indicators increase level
-        if any(word in jd_lower for word in ['lead', 'manage', 'strategic', 'architect']):
+        if 'leadership' in found:
             base_level = min(base_level + 1, 7)
         
         # Mentoring/teaching increases level
-        if any(word in jd_lower for word in ['mentor', 'train', 'guide', 'coach']):
+        if 'mentoring' in found:
             base_level = min(base_level + 1, 7)
         
         return base_level
     
-    def _get_level_description(self, skill_code: str, level: int) -> str:
+    def _get_level_description(self, skill_code: str, level: int, levels: Dict[int, Dict] = None) -> str:
         """
         Get level-specific description for a skill from Knowledge Graph
+        
+        Args:
+            skill_code: SFIA skill code
+            level: SFIA level (1-7)
+            levels: Pre-fetched level details for the skill (skips the lookup)
         """
         try:
-            levels = self.sfia_service.get_skill_levels_detail(skill_code)
+            if levels is None:
+                levels = self._levels_cache.get(skill_code)
+            if levels is None:
+                levels = self.sfia_service.get_skill_levels_detail(skill_code)
             if levels and level in levels:
                 desc = levels[level].get('description', '')
                 if desc:
@@ -487,20 +1887,14 @@ class JobDescriptionEnhancer:
         except Exception as e:
             logger.debug(f"Could not get level description: {e}")
         
-        # Standard SFIA level descriptions
-        level_descriptions = {
-            1: "Follows instructions and guidance. Learns basic principles and techniques.",
-            2: "Assists with tasks under supervision. Developing practical experience.",
-            3: "Applies skills independently. Takes responsibility for own work outcomes.",
-            4: "Enables others. Provides guidance to less experienced colleagues.",
-            5: "Ensures quality and best practices. Advises on complex issues.",
-            6: "Initiates strategic decisions. Influences organizational direction.",
-            7: "Sets strategy. Inspires and mobilizes teams for enterprise-wide initiatives."
-        }
-        
-        return level_descriptions.get(level, f"Level {level} proficiency")
+        return _LEVEL_DESCRIPTIONS.get(level, f"Level {level} proficiency")
     
-    def enhance(self, job_description: str, org_context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def enhance(
+        self,
+        job_description: str,
+        org_context: Dict[str, Any] = None,
+        stream_callback: Callable[[str], None] = None
+    ) -> Dict[str, Any]:
         """
         Main method to enhance a job description
         
@@ -519,33 +1913,340 @@ class JobDescriptionEnhancer:
                 - location: Work location
                 - work_environment: Work environment (remote, hybrid, onsite)
                 - reporting_to: Reporting manager/title
+            stream_callback: Optional callable receiving each regenerated JD token as it is generated
             
         Returns:
             Dictionary containing enhanced skills and metadata
         """
+        invalid = self._invalid_input_result(job_description, org_context)
+        if invalid:
+            return invalid
+        
+        if stream_callback is not None:
+            for event in self.stream_enhance(job_description, org_context):
+                if event["stage"] == "jd_token":
+                    stream_callback(event["token"])
+                elif event["stage"] == "complete":
+                    return event["result"]
+        
         logger.info("Starting job description enhancement")
         logger.info(f"Knowledge Graph status: Connected")
         if org_context:
             logger.info(f"Organizational context provided: {list(org_context.keys())}")
         
-        # Initialize state
-        initial_state = {
+        # Run the graph
+        initial_state = self._initial_state(job_description, org_context)
+        if self.direct_execution:
+            final_state = self._run_direct(initial_state)
+        else:
+            final_state = self._graph_for(initial_state).invoke(initial_state)
+        result = self._format_result(final_state)
+        
+        logger.info(f"Enhancement complete: {result['skills_count']} skills identified")
+        
+        return result
+    
+    async def aenhance(self, job_description: str, org_context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Async variant of enhance for event-loop servers
+        
+        LLM calls are awaited natively and blocking KG queries run on worker
+        threads, so one process can serve many enhancements concurrently.
+        
+        Args:
+            job_description: The original job description
+            org_context: Optional organizational context dictionary (see enhance)
+            
+        Returns:
+            Dictionary containing enhanced skills and metadata
+        """
+        invalid = self._invalid_input_result(job_description, org_context)
+        if invalid:
+            return invalid
+        
+        logger.info("Starting job description enhancement (async)")
+        if org_context:
+            logger.info(f"Organizational context provided: {list(org_context.keys())}")
+        
+        initial_state = self._initial_state(job_description, org_context)
+        final_state = await self._graph_for(initial_state).ainvoke(initial_state)
+        result = self._format_result(final_state)
+        
+        logger.info(f"Enhancement complete: {result['skills_count']} skills identified")
+        
+        return result
+    
+    def enhance_batch(
+        self,
+        job_descriptions: List[str],
+        org_contexts: List[Dict[str, Any]] = None,
+        batch_size: int = None,
+        max_concurrency: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Enhance several job descriptions, packing keyword extraction into shared LLM calls
+        
+        Uncached JDs are sent to the LLM in groups of batch_size; any JD a group
+        response misses (or a group that fails) falls back to per-JD extraction
+        inside the workflow. The workflows then run concurrently.
+        
+        Args:
+            job_descriptions: Original job descriptions
+            org_contexts: Optional organizational context per JD (see enhance)
+            batch_size: JDs per extraction call (defaults to EXTRACTION_BATCH_SIZE env var or 20)
+            max_concurrency: Workflows run at once (defaults to ENHANCE_BATCH_CONCURRENCY env var or 4)
+            
+        Returns:
+            One result dictionary per JD, in input order (see enhance)
+        """
+        batch_size = batch_size or int(os.getenv("EXTRACTION_BATCH_SIZE", "20"))
+        max_concurrency = max_concurrency or int(os.getenv("ENHANCE_BATCH_CONCURRENCY", "4"))
+        org_contexts = org_contexts or [None] * len(job_descriptions)
+        
+        logger.info(f"Starting batch enhancement of {len(job_descriptions)} job descriptions")
+        
+        # Invalid inputs get their failure result without entering the workflow
+        results = [
+            self._invalid_input_result(job_description, org_context)
+            for job_description, org_context in zip(job_descriptions, org_contexts)
+        ]
+        
+        # JDs without text are created from context and need no extraction; fused
+        # and code modes extract inside the workflow, so nothing is pre-extracted
+        keywords = [None] * len(job_descriptions)
+        pending = []
+        for i, job_description in enumerate(job_descriptions):
+            if results[i] or not job_description.strip():
+                continue
+            if self.fused_enhancer is not None or self.code_extractor is not None:
+                continue
+            cached_keywords, _ = self._lookup_cached_keywords(job_description)
+            if cached_keywords is not None:
+                keywords[i] = cached_keywords
+            else:
+                pending.append(i)
+        
+        for start in range(0, len(pending), batch_size):
+            group = pending[start:start + batch_size]
+            if len(group) < 2:
+                continue  # A lone JD gains nothing from packing; the workflow extracts it
+            try:
+                group_keywords = self._extract_keywords_batch([job_descriptions[i] for i in group])
+            except Exception as e:
+                logger.warning(f"⚠️ Batch extraction failed, extracting per JD: {e}")
+                continue
+            for i, jd_keywords in zip(group, group_keywords):
+                if jd_keywords:
+                    keywords[i] = jd_keywords
+                    self._cache_keywords(job_descriptions[i], None, jd_keywords)
+        
+        runnable = [i for i, result in enumerate(results) if result is None]
+        states = [
+            self._initial_state(job_descriptions[i], org_contexts[i], extracted_keywords=keywords[i])
+            for i in runnable
+        ]
+        # Each workflow variant runs its states as one batch; results keep input order
+        final_states = [None] * len(states)
+        for graph in (self.graph, self.creation_graph):
+            positions = [p for p, state in enumerate(states) if self._graph_for(state) is graph]
+            if positions:
+                batch = graph.batch([states[p] for p in positions], config={"max_concurrency": max_concurrency})
+                for p, final_state in zip(positions, batch):
+                    final_states[p] = final_state
+        
+        for i, final_state in zip(runnable, final_states):
+            results[i] = self._format_result(final_state)
+        logger.info(f"Batch enhancement complete: {len(results)} job descriptions")
+        
+        return results
+    
+    def stream_enhance(self, job_description: str, org_context: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Enhance a job description, yielding each stage's output as soon as it is ready
+        
+        Args:
+            job_description: The original job description
+            org_context: Optional organizational context dictionary (see enhance)
+            
+        Yields:
+            Stage events tagged by 'stage' ('keywords', 'keyword_matched',
+            'sfia_skills', 'skills', then one 'jd_token' per regenerated JD
+            token), ending with a 'complete' event holding the same result
+            enhance() returns
+        """
+        invalid = self._invalid_input_result(job_description, org_context)
+        if invalid:
+            yield {"stage": "complete", "result": invalid}
+            return
+        
+        logger.info("Starting job description enhancement (streaming)")
+        
+        initial_state = self._initial_state(job_description, org_context)
+        final_state = {}
+        for mode, chunk in self._graph_for(initial_state).stream(
+            initial_state,
+            stream_mode=["updates", "values", "messages"]
+        ):
+            if mode == "values":
+                final_state = chunk
+                continue
+            if mode == "messages":
+                event = self._token_event(*chunk)
+                if event:
+                    yield event
+                continue
+            for node, update in chunk.items():
+                event = self._stage_event(node, update)
+                if event:
+                    yield event
+        
+        yield {"stage": "complete", "result": self._format_result(final_state)}
+    
+    async def astream_enhance(self, job_description: str, org_context: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async variant of stream_enhance
+        
+        Args:
+            job_description: The original job description
+            org_context: Optional organizational context dictionary (see enhance)
+            
+        Yields:
+            Stage events, ending with a 'complete' event (see stream_enhance)
+        """
+        invalid = self._invalid_input_result(job_description, org_context)
+        if invalid:
+            yield {"stage": "complete", "result": invalid}
+            return
+        
+        logger.info("Starting job description enhancement (async streaming)")
+        
+        initial_state = self._initial_state(job_description, org_context)
+        final_state = {}
+        async for mode, chunk in self._graph_for(initial_state).astream(
+            initial_state,
+            stream_mode=["updates", "values", "messages"]
+        ):
+            if mode == "values":
+                final_state = chunk
+                continue
+            if mode == "messages":
+                event = self._token_event(*chunk)
+                if event:
+                    yield event
+                continue
+            for node, update in chunk.items():
+                event = self._stage_event(node, update)
+                if event:
+                    yield event
+        
+        yield {"stage": "complete", "result": self._format_result(final_state)}
+    
+    def _token_event(self, message_chunk, metadata: Dict[str, Any]):
+        """
+        Convert a streamed LLM token into a 'jd_token' event
+        
+        Returns:
+            Event dictionary, or None for tokens from nodes other than regenerate_jd
+        """
+        if metadata.get("langgraph_node") != "regenerate_jd" or not message_chunk.content:
+            return None
+        return {"stage": "jd_token", "token": message_chunk.content}
+    
+    def _stage_event(self, node: str, update: Dict[str, Any]):
+        """
+        Convert a node's state update into a client-facing stage event
+        
+        Returns:
+            Event dictionary, or None for nodes whose output only appears in the final result
+        """
+        if not update:
+            return None
+        if node == "extract_skills":
+            return {"stage": "keywords", "extracted_keywords": update.get("extracted_keywords", [])}
+        if node == "map_keyword":
+            match = update["keyword_matches"][0]
+            return {"stage": "keyword_matched", "keyword": match["keyword"], "results": match["results"]}
+        if node == "map_to_sfia":
+            return {"stage": "sfia_skills", "sfia_skills": update.get("sfia_skills", [])}
+        if node == "set_skill_level":
+            return {"stage": "skills", "skills": update.get("enhanced_skills", [])}
+        return None
+    
+    def _run_direct(self, state: EnhancementState) -> EnhancementState:
+        """
+        Run the workflow nodes in graph order without the LangGraph runtime
+        
+        Mirrors _build_graph (or _build_creation_graph): the keyword fan-out runs
+        on the KG lookup pool and node updates are merged the way the state
+        reducers would merge them.
+        
+        Args:
+            state: Initial workflow state
+            
+        Returns:
+            Final workflow state
+        """
+        if self._is_jd_creation(state):
+            self._merge_update(state, self.regenerate_jd_node(state))
+            return state
+        
+        self._merge_update(state, self.extract_skills_node(state))
+        
+        dispatch = self._dispatch_keywords(state)
+        if dispatch != "map_to_sfia":
+            for update in _KG_LOOKUP_EXECUTOR.map(lambda send: self.map_keyword_node(send.arg), dispatch):
+                self._merge_update(state, update)
+        
+        for node in (self.map_to_sfia_node, self.set_skill_level_node, self.regenerate_jd_node):
+            self._merge_update(state, node(state))
+        
+        return state
+    
+    def _merge_update(self, state: EnhancementState, update: Dict[str, Any]) -> None:
+        """Apply a node's partial update to the state, appending to the add-reducer channels"""
+        for key, value in update.items():
+            if key in ("messages", "keyword_matches"):
+                state[key] = state[key] + value
+            else:
+                state[key] = value
+    
+    def _initial_state(
+        self,
+        job_description: str,
+        org_context: Dict[str, Any] = None,
+        extracted_keywords: List[str] = None
+    ) -> EnhancementState:
+        """Build the initial workflow state (pre-extracted keywords skip extraction)"""
+        return {
             "job_description": job_description,
             "org_context": org_context or {},
-            "extracted_keywords": [],
+            "extracted_keywords": extracted_keywords or [],
+            "keyword_matches": [],
             "sfia_skills": [],
             "enhanced_skills": [],
             "regenerated_jd": "",
+            "jd_outline": "",
             "messages": [],
             "error": "",
             "kg_connected": self.kg_connected
         }
+    
+    def _invalid_input_result(self, job_description: str, org_context: Dict[str, Any] = None):
+        """
+        Build the failure result for input that fails validation, without running the workflow
         
-        # Run the graph
-        final_state = self.graph.invoke(initial_state)
-        
-        # Format output
-        result = {
+        Returns:
+            Result dictionary (see enhance), or None when the input is valid
+        """
+        error = validate_enhancement_input(job_description, org_context)
+        if error is None:
+            return None
+        logger.warning(f"⚠️ Enhancement skipped: {error}")
+        return self._format_result({**self._initial_state(job_description or "", org_context), "error": error})
+    
+    def _format_result(self, final_state: EnhancementState) -> Dict[str, Any]:
+        """Format the final workflow state as the enhancement result"""
+        return {
             "success": not final_state.get("error"),
             "error": final_state.get("error", ""),
             "extracted_keywords": final_state.get("extracted_keywords", []),
@@ -555,20 +2256,97 @@ class JobDescriptionEnhancer:
             "workflow_messages": final_state.get("messages", []),
             "knowledge_graph_connected": final_state.get("kg_connected", True)
         }
+
+
+def _build_openai_llm(openai_model: str):
+    """Construct the OpenAI chat model used for JD and interview plan generation"""
+    return ChatOpenAI(
+        model=openai_model,
+        api_key=os.getenv("OPENAI_API_KEY", "").strip(),
+        temperature=0.3,
+        max_tokens=4000,
+        max_retries=_LLM_MAX_RETRIES,
+        rate_limiter=_LLM_RATE_LIMITER,
+    )
+
+
+def _build_ollama_llm(ollama_model: str):
+    """Construct the Ollama chat model used when OpenAI is not configured"""
+    return ChatOllama(
+        model=ollama_model,
+        base_url=os.getenv("OLLAMA_URL", "http://localhost:11434"),
+        temperature=0.3,
+        rate_limiter=_LLM_RATE_LIMITER,
+    )
+
+
+# Chat models for one-shot generation keyed by ollama_model; clients hold
+# connection pools, so they are built once per process and reused
+_llm_instances = {}
+_llm_lock = threading.Lock()
+
+
+def get_llm(ollama_model: str = None):
+    """
+    Get or create the shared chat model for one-shot generation (OpenAI primary, Ollama fallback)
+    
+    Args:
+        ollama_model: Ollama model to use (defaults to OLLAMA_MODEL env var or 'llama3:latest')
         
-        logger.info(f"Enhancement complete: {result['skills_count']} skills identified")
+    Returns:
+        Chat model instance
         
-        return result
+    Raises:
+        RuntimeError: If neither provider can be initialized
+    """
+    with _llm_lock:
+        if ollama_model not in _llm_instances:
+            _llm_instances[ollama_model] = _create_llm(ollama_model)
+        return _llm_instances[ollama_model]
+
+
+def _create_llm(ollama_model: str = None):
+    """Build the chat model for get_llm"""
+    if os.getenv("OPENAI_API_KEY", "").strip() and OPENAI_AVAILABLE:
+        openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        try:
+            llm = _build_openai_llm(openai_model)
+            logger.info(f"✅ Using OpenAI LLM: {openai_model}")
+            return llm
+        except Exception as e:
+            logger.warning(f"⚠️ OpenAI init failed: {e}")
+    
+    if OLLAMA_AVAILABLE:
+        ollama_model = ollama_model or os.getenv("OLLAMA_MODEL", "llama3:latest")
+        try:
+            llm = _build_ollama_llm(ollama_model)
+            logger.info(f"✅ Using Ollama LLM: {ollama_model}")
+            return llm
+        except Exception as e:
+            logger.error(f"❌ Ollama init failed: {e}")
+    
+    logger.error("❌ No LLM available!")
+    raise RuntimeError("No LLM available")
+
 
+def reset_llm():
+    """Reset the shared chat models (useful for testing)"""
+    with _llm_lock:
+        _llm_instances.clear()
 
-# Singleton enhancer instance
-_enhancer_instance = None
+
+# Enhancer instances keyed by (fuseki_url, ollama_model); each holds a compiled
+# graph and a connected LLM, so they are built once per process and reused
+_enhancer_instances = {}
+_enhancer_lock = threading.Lock()
 
 
 def create_enhancer(fuseki_url: str = None, ollama_model: str = None) -> JobDescriptionEnhancer:
     """
     Factory function to create a JobDescriptionEnhancer instance
     
+    Always builds a new instance; request handlers should use get_enhancer.
+    
     Args:
         fuseki_url: Fuseki server URL
         ollama_model: Ollama model to use
@@ -581,7 +2359,7 @@ def create_enhancer(fuseki_url: str = None, ollama_model: str = None) -> JobDesc
 
 def get_enhancer(fuseki_url: str = None, ollama_model: str = None) -> JobDescriptionEnhancer:
     """
-    Get or create a singleton JobDescriptionEnhancer instance
+    Get or create the shared JobDescriptionEnhancer for a configuration
     
     Args:
         fuseki_url: Fuseki server URL
@@ -590,18 +2368,19 @@ def get_enhancer(fuseki_url: str = None, ollama_model: str = None) -> JobDescrip
     Returns:
         JobDescriptionEnhancer instance
     """
-    global _enhancer_instance
+    key = (fuseki_url, ollama_model)
     
-    if _enhancer_instance is None:
-        _enhancer_instance = JobDescriptionEnhancer(fuseki_url=fuseki_url, ollama_model=ollama_model)
-    
-    return _enhancer_instance
+    # Construction runs under the lock so concurrent first requests build one instance
+    with _enhancer_lock:
+        if key not in _enhancer_instances:
+            _enhancer_instances[key] = JobDescriptionEnhancer(fuseki_url=fuseki_url, ollama_model=ollama_model)
+        return _enhancer_instances[key]
 
 
 def reset_enhancer():
-    """Reset the singleton enhancer instance (useful for testing)"""
-    global _enhancer_instance
-    _enhancer_instance = None
+    """Reset the shared enhancer instances (useful for testing)"""
+    with _enhancer_lock:
+        _enhancer_instances.clear()
 
 
 # ============= PUBLIC API FUNCTIONS =============
@@ -638,60 +2417,39 @@ def create_jd(org_context: Dict[str, Any]) -> Dict[str, Any]:
     logger.info(f"Company: {org_context.get('company_name', 'N/A')}")
     
     try:
-        # Initialize LLM (OpenAI primary, Ollama fallback)
-        logger.info("Step 1: Initializing LLM")
-        llm = None
-        openai_api_key = os.getenv("OPENAI_API_KEY", "").strip()
-        openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        
-        if openai_api_key and OPENAI_AVAILABLE:
-            logger.info("Attempting OpenAI initialization...")
-            try:
-                llm = ChatOpenAI(
-                    model=openai_model,
-                    api_key=openai_api_key,
-                    temperature=0.3,
-                    max_tokens=4000,
-                )
-                logger.info(f"✅ Using OpenAI LLM: {openai_model}")
-            except Exception as e:
-                logger.warning(f"⚠️ OpenAI init failed: {e}")
-        
-        # Fallback to Ollama
-        if llm is None and OLLAMA_AVAILABLE:
-            logger.info("Attempting Ollama initialization...")
-            ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
-            ollama_model = os.getenv("OLLAMA_MODEL", "llama3:latest")
-            try:
-                llm = ChatOllama(
-                    model=ollama_model,
-                    base_url=ollama_url,
-                    temperature=0.3,
-                )
-                logger.info(f"✅ Using Ollama LLM: {ollama_model}")
-            except Exception as e:
-                logger.error(f"❌ Ollama init failed: {e}")
-        
-        if llm is None:
-            logger.error("❌ No LLM available!")
-            raise RuntimeError("No LLM available")
+        # Shared chat model (OpenAI primary, Ollama fallback), built on first use
+        logger.info("Step 1: Getting LLM")
+        llm = get_llm()
         
         # Create job description using LLM
         logger.info("Step 2: Preparing prompts")
-        system_prompt = get_jd_creation_system_prompt()
         user_prompt = format_jd_creation_user_prompt(org_context)
         
-        logger.info(f"System prompt length: {len(system_prompt)} chars")
+        logger.info(f"System prompt length: {len(_JD_CREATION_SYSTEM_MESSAGE.content)} chars")
         logger.info(f"User prompt length: {len(user_prompt)} chars")
         
         messages = [
-            SystemMessage(content=system_prompt),
+            _JD_CREATION_SYSTEM_MESSAGE,
             HumanMessage(content=user_prompt)
         ]
         
-        logger.info("Step 3: Calling LLM to create job description")
-        response = llm.invoke(messages)
-        job_description = response.content.strip()
+        # Identical contexts reuse the created JD (same opt-in as regeneration caching)
+        cache = None
+        cache_key = None
+        job_description = None
+        if os.getenv("REGENERATION_CACHE_ENABLED", "false").lower() == "true":
+            cache = get_cache("create_jd", maxsize=256)
+            cache_key = _prompt_cache_key(llm, messages)
+            job_description = cache.get(cache_key)
+        
+        if job_description is not None:
+            logger.info("Step 3: Creation cache hit - reusing job description")
+        else:
+            logger.info("Step 3: Calling LLM to create job description")
+            response = _with_max_tokens(llm, _creation_token_budget(org_context)).invoke(messages)
+            job_description = response.content.strip()
+            if cache is not None and job_description:
+                cache.set(cache_key, job_description)
         
         logger.info(f"✅ Job description created: {len(job_description)} characters")
         logger.info(f"First 100 chars: {job_description[:100]}...")
@@ -741,6 +2499,43 @@ def enhance_jd(job_description: str, org_context: Dict[str, Any] = None) -> Dict
     
     result = enhancer.enhance(job_description, org_context=org_context)
     
+    return _enhance_jd_response(result)
+
+
+# Workflows one event loop runs at once in enhance_jd_async (protects the LLM rate limit)
+_ASYNC_ENHANCE_CONCURRENCY = int(os.getenv("ENHANCE_ASYNC_CONCURRENCY", "32"))
+
+# Semaphores are bound to an event loop, so each loop gets its own
+_async_enhance_semaphores = weakref.WeakKeyDictionary()
+
+
+async def enhance_jd_async(job_description: str, org_context: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Async variant of enhance_jd for callers running many enhancements on one event loop
+    
+    Args:
+        job_description: The original job description text
+        org_context: Optional organizational context dictionary
+    
+    Returns:
+        Same dictionary as enhance_jd
+    """
+    logger.info("API: enhance_jd_async called")
+    enhancer = get_enhancer()
+    
+    loop = asyncio.get_running_loop()
+    semaphore = _async_enhance_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _async_enhance_semaphores[loop] = asyncio.Semaphore(_ASYNC_ENHANCE_CONCURRENCY)
+    
+    async with semaphore:
+        result = await enhancer.aenhance(job_description, org_context=org_context)
+    
+    return _enhance_jd_response(result)
+
+
+def _enhance_jd_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape an enhancer result for the public API"""
     return {
         'success': result.get('success', False),
         'job_description': result.get('regenerated_jd', ''),
@@ -797,39 +2592,7 @@ def create_interview_plan(
         seniority, system_prompt = get_seniority_aware_interview_prompt(role_title, role_grade)
         logger.info(f"  Detected Seniority: {seniority.value}")
         
-        # Initialize LLM (OpenAI primary, Ollama fallback)
-        llm = None
-        openai_api_key = os.getenv("OPENAI_API_KEY", "").strip()
-        openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        
-        if openai_api_key and OPENAI_AVAILABLE:
-            try:
-                llm = ChatOpenAI(
-                    model=openai_model,
-                    api_key=openai_api_key,
-                    temperature=0.3,
-                    max_tokens=4000,
-                )
-                logger.info(f"✅ Using OpenAI LLM for interview plan")
-            except Exception as e:
-                logger.warning(f"⚠️ OpenAI init failed: {e}")
-        
-        # Fallback to Ollama
-        if llm is None and OLLAMA_AVAILABLE:
-            ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
-            ollama_model = ollama_model or os.getenv("OLLAMA_MODEL", "llama3:latest")
-            try:
-                llm = ChatOllama(
-                    model=ollama_model,
-                    base_url=ollama_url,
-                    temperature=0.3,
-                )
-                logger.info(f"✅ Using Ollama LLM for interview plan")
-            except Exception as e:
-                logger.error(f"❌ Ollama init failed: {e}")
-        
-        if llm is None:
-            raise RuntimeError("No LLM available for interview plan generation")
+        llm = get_llm(ollama_model=ollama_model)
         
         # Format user prompt with JD and interview context
         user_prompt = format_interview_plan_user_prompt_with_context(
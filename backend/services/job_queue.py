@@ -0,0 +1,226 @@
+"""
+Job Queue Service
+Runs JD enhancements on background workers fed by a Redis Stream, so API
+workers hand back a job ID instead of holding the request for the LLM calls
+"""
+
+import os
+import json
+import uuid
+import time
+import socket
+import logging
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from .cache_service import get_redis_client
+from .jd_services import get_enhancer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ENHANCE_STREAM = os.getenv('ENHANCE_QUEUE_STREAM', 'jd:enhance')
+WORKER_GROUP = 'enhance-workers'
+
+# Job records (status and result) expire after this many seconds
+_JOB_TTL = int(os.getenv('ENHANCE_JOB_TTL', '86400'))
+
+# Stream entries kept for inspection once acknowledged (approximate trim)
+_STREAM_MAXLEN = int(os.getenv('ENHANCE_QUEUE_MAXLEN', '10000'))
+
+# Jobs left pending this long are presumed orphaned by a crashed worker and
+# reclaimed; keep it well above the longest enhancement (LLM calls and retries)
+_CLAIM_IDLE_MS = int(os.getenv('ENHANCE_JOB_CLAIM_IDLE_MS', '1800000'))
+
+# Deliveries before a job that keeps taking its worker down is marked failed
+_MAX_ATTEMPTS = int(os.getenv('ENHANCE_JOB_MAX_ATTEMPTS', '2'))
+
+# Pause before reading again after a Redis error
+_RETRY_DELAY = 5
+
+
+def _job_key(job_id):
+    return f"jd:result:{job_id}"
+
+
+def _store_job(client, job_id, record):
+    client.set(_job_key(job_id), json.dumps(record), ex=_JOB_TTL)
+
+
+def _load_job(client, job_id):
+    payload = client.get(_job_key(job_id))
+    return json.loads(payload) if payload else None
+
+
+def enqueue_enhance(job_description, org_context=None, user_id=None):
+    """
+    Queue a JD enhancement for a background worker
+    
+    Args:
+        job_description: The original job description text
+        org_context: Optional organizational context dictionary
+        user_id: Requesting user, recorded so only they can read the result
+    
+    Returns:
+        Job ID to poll with get_job
+    
+    Raises:
+        RuntimeError: If Redis is not configured
+    """
+    client = get_redis_client()
+    if client is None:
+        raise RuntimeError("The enhancement queue requires REDIS_URL")
+    
+    job_id = uuid.uuid4().hex
+    job = {
+        'job_id': job_id,
+        'user_id': user_id,
+        'job_description': job_description,
+        'org_context': org_context or {}
+    }
+    
+    pipe = client.pipeline()
+    pipe.set(_job_key(job_id), json.dumps({'status': 'queued', 'user_id': user_id}), ex=_JOB_TTL)
+    pipe.xadd(ENHANCE_STREAM, {'job': json.dumps(job)}, maxlen=_STREAM_MAXLEN, approximate=True)
+    pipe.execute()
+    
+    logger.info(f"Queued enhancement job {job_id}")
+    return job_id
+
+
+def get_job(job_id):
+    """
+    Get a queued job's record
+    
+    Args:
+        job_id: ID returned by enqueue_enhance
+    
+    Returns:
+        Dictionary with 'status' ('queued', 'running', 'complete' or 'failed'),
+        'user_id', and 'result' or 'error' once finished; None if unknown or expired
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+    
+    return _load_job(client, job_id)
+
+
+def _process_job(client, enhancer, job):
+    """Run one enhancement job and store its outcome"""
+    job_id = job['job_id']
+    user_id = job.get('user_id')
+    
+    record = _load_job(client, job_id) or {}
+    if record.get('status') in ('complete', 'failed'):
+        return  # Finished, but its acknowledgement was lost
+    attempts = record.get('attempts', 0) + 1
+    if attempts > _MAX_ATTEMPTS:
+        logger.error(f"❌ Enhancement job {job_id} abandoned after {_MAX_ATTEMPTS} attempts")
+        _store_job(client, job_id, {
+            'status': 'failed', 'user_id': user_id, 'attempts': attempts - 1,
+            'error': 'The enhancement worker stopped while processing this job'
+        })
+        return
+    _store_job(client, job_id, {'status': 'running', 'user_id': user_id, 'attempts': attempts})
+    
+    try:
+        result = enhancer.enhance(job['job_description'], org_context=job.get('org_context'))
+        outcome = {'status': 'complete', 'user_id': user_id, 'attempts': attempts, 'result': result}
+        logger.info(f"Completed enhancement job {job_id}")
+    except Exception as e:
+        logger.error(f"❌ Enhancement job {job_id} failed: {e}")
+        outcome = {'status': 'failed', 'user_id': user_id, 'attempts': attempts, 'error': str(e)}
+    _store_job(client, job_id, outcome)
+
+
+def _handle_entry(client, enhancer, message_id, fields):
+    """
+    Process and acknowledge one stream entry
+    
+    Redis errors are logged rather than raised so one job cannot stop the worker;
+    an entry left unacknowledged is reclaimed later.
+    """
+    try:
+        job = json.loads(fields[b'job'])
+    except (KeyError, ValueError) as e:
+        logger.error(f"❌ Dropping malformed job {message_id}: {e}")
+    else:
+        try:
+            _process_job(client, enhancer, job)
+        except redis.RedisError as e:
+            logger.error(f"❌ Redis error on enhancement job {job.get('job_id')}, leaving it pending: {e}")
+            return
+    
+    try:
+        client.xack(ENHANCE_STREAM, WORKER_GROUP, message_id)
+    except redis.RedisError as e:
+        logger.error(f"❌ Could not acknowledge job {message_id}: {e}")
+
+
+def _reclaim_stalled(client, enhancer, consumer):
+    """Take over and run entries other workers left pending past _CLAIM_IDLE_MS"""
+    start_id = '0-0'
+    while True:
+        reply = client.xautoclaim(ENHANCE_STREAM, WORKER_GROUP, consumer, _CLAIM_IDLE_MS, start_id=start_id, count=10)
+        start_id, messages = reply[0], reply[1]
+        for message_id, fields in messages:
+            if not fields:
+                # Trimmed from the stream before it ran (Redis 6.2 still lists it as pending)
+                client.xack(ENHANCE_STREAM, WORKER_GROUP, message_id)
+                continue
+            logger.warning(f"⚠️ Reclaimed stalled enhancement job {message_id}")
+            _handle_entry(client, enhancer, message_id, fields)
+        if start_id in (b'0-0', '0-0'):
+            return
+
+
+def run_worker(consumer=None, block_ms=5000):
+    """
+    Consume enhancement jobs until interrupted
+    
+    Workers share the WORKER_GROUP consumer group, so each job is delivered
+    to exactly one of them. Jobs a crashed worker left pending are reclaimed
+    at startup and whenever the stream is idle.
+    
+    Args:
+        consumer: Consumer name within the group (defaults to host-pid)
+        block_ms: How long each read waits for new jobs
+    """
+    redis_url = os.getenv('REDIS_URL', '').strip()
+    if not redis_url or not REDIS_AVAILABLE:
+        raise RuntimeError("The enhancement worker requires REDIS_URL and the redis package")
+    
+    # A dedicated client: the shared one's socket timeout is shorter than a blocking read
+    client = redis.Redis.from_url(redis_url)
+    consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+    
+    try:
+        client.xgroup_create(ENHANCE_STREAM, WORKER_GROUP, id='0', mkstream=True)
+    except redis.ResponseError as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+    
+    enhancer = get_enhancer()
+    logger.info(f"✅ Enhancement worker {consumer} listening on {ENHANCE_STREAM}")
+    
+    reclaim = True
+    while True:
+        try:
+            if reclaim:
+                _reclaim_stalled(client, enhancer, consumer)
+            entries = client.xreadgroup(WORKER_GROUP, consumer, {ENHANCE_STREAM: '>'}, count=1, block=block_ms)
+        except redis.RedisError as e:
+            logger.error(f"❌ Enhancement queue read failed, retrying in {_RETRY_DELAY}s: {e}")
+            time.sleep(_RETRY_DELAY)
+            continue
+        
+        reclaim = not entries
+        for _, messages in entries or []:
+            for message_id, fields in messages:
+                _handle_entry(client, enhancer, message_id, fields)
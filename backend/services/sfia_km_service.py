@@ -5,13 +5,137 @@ Enhanced with environment configuration, connection validation, and correct SFIA
 """
 
 import os
-from SPARQLWrapper import SPARQLWrapper, JSON
+import re
+import asyncio
+import hashlib
+import weakref
+from functools import lru_cache
+from SPARQLWrapper import SPARQLWrapper, JSON, TSV, POST
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from .cache_service import get_cache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Characters stripped from search keywords before they reach SPARQL or scoring
+_UNSAFE_KEYWORD_CHARS = re.compile(r'[^a-zA-Z0-9\s\-]')
+
+
+# GROUP_CONCAT separator for collapsed level rows (a control character no description contains)
+_LEVEL_SEPARATOR = '\x1f'
+_LEVEL_SEPARATOR_ESCAPE = '\\u001F'
+
+
+def _sparql_literal(value):
+    """Quote a value as a SPARQL string literal"""
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
+    return f'"{escaped}"'
+
+
+def _query_cache_key(query, result_format=JSON):
+    """Hash a query with whitespace collapsed, so indentation variants share an entry"""
+    canonical = f"{result_format}:{' '.join(query.split())}"
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _int_keys(levels):
+    """Restore int level numbers on a levels dict (JSON stringifies them in Redis)"""
+    return {int(level): detail for level, detail in levels.items()}
+
+
+# Accept headers for the result formats _run_query understands
+_RESULT_MEDIA_TYPES = {
+    JSON: 'application/sparql-results+json',
+    TSV: 'text/tab-separated-values'
+}
+
+# Queries up to this length go as GET so HTTP caches in front of Fuseki can serve them
+_GET_QUERY_MAX_LENGTH = 1024
+
+_PREFIX_DECLARATION = re.compile(r'^[ \t]*PREFIX[ \t]+([\w-]*):[ \t]*<[^>]*>[ \t]*\n?', re.IGNORECASE | re.MULTILINE)
+
+
+@lru_cache(maxsize=1024)
+def _prune_prefixes(query):
+    """Drop PREFIX declarations the query body never uses (the shared block declares nine)"""
+    body = _PREFIX_DECLARATION.sub('', query)
+    
+    def keep_if_used(match):
+        used = re.search(rf'(?<![\w-]){re.escape(match.group(1))}:', body)
+        return match.group(0) if used else ''
+    
+    return _PREFIX_DECLARATION.sub(keep_if_used, query)
+
+
+# Escape sequences inside TSV string literals (Turtle syntax)
+_TSV_ESCAPE = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)')
+_TSV_ESCAPE_CHARS = {'t': '\t', 'n': '\n', 'r': '\r', 'b': '\b', 'f': '\f'}
+
+
+def _tsv_unescape(match):
+    escape = match.group(1)
+    if escape[0] in 'uU' and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    return _TSV_ESCAPE_CHARS.get(escape, escape)
+
+
+def _tsv_term(cell):
+    """Get the plain value of a TSV result cell (IRI, literal or bare number)"""
+    if cell.startswith('<') and cell.endswith('>'):
+        return cell[1:-1]
+    if cell.startswith('"'):
+        # Drop any language tag or datatype after the closing quote
+        return _TSV_ESCAPE.sub(_tsv_unescape, cell[1:cell.rindex('"')])
+    return cell
+
+
+def _parse_tsv_results(text):
+    """
+    Parse SPARQL TSV results into the JSON results structure
+    
+    TSV carries each term once, without JSON's per-cell type objects, so large
+    lists are a fraction of the bytes. Literals never contain raw tabs or
+    newlines, so rows and cells split directly.
+    
+    Args:
+        text: TSV response body
+        
+    Returns:
+        Dictionary shaped like SPARQL JSON results (values only, no term types)
+    """
+    lines = text.split('\n')
+    variables = [var.lstrip('?') for var in lines[0].rstrip('\r').split('\t')]
+    bindings = []
+    for line in lines[1:]:
+        line = line.rstrip('\r')
+        if not line:
+            continue
+        bindings.append({
+            var: {'value': _tsv_term(cell)}
+            for var, cell in zip(variables, line.split('\t')) if cell
+        })
+    return {'head': {'vars': variables}, 'results': {'bindings': bindings}}
+
+
+def _v(binding, key, default=''):
+    """Get the value of a SPARQL JSON result binding, or default if unbound"""
+    term = binding.get(key)
+    return term['value'] if term else default
+
 
 class SFIAKnowledgeService:
     """Service class for querying SFIA knowledge graph via SPARQL"""
@@ -20,13 +144,15 @@ class SFIAKnowledgeService:
     _instance = None
     _connection_validated = False
     
-    def __init__(self, fuseki_url=None, dataset=None):
+    def __init__(self, fuseki_url=None, dataset=None, max_connections=None, max_keepalive=None):
         """
         Initialize the SFIA Knowledge Service
         
         Args:
             fuseki_url: Base URL of Fuseki server (defaults to env var)
             dataset: Name of the dataset in Fuseki (defaults to env var)
+            max_connections: HTTP connection pool size (defaults to KG_MAX_CONNECTIONS or 32)
+            max_keepalive: Idle keep-alive connections kept open (defaults to KG_MAX_KEEPALIVE or 16)
         """
         # Read from environment variables with fallbacks
         self.fuseki_url = fuseki_url or os.getenv('FUSEKI_URL', 'http://localhost:3030')
@@ -36,6 +162,11 @@ class SFIAKnowledgeService:
         
         self.endpoint = f"{self.fuseki_url}/{self.dataset}/query"
         self.update_endpoint = f"{self.fuseki_url}/{self.dataset}/update"
+        # Credentials for SPARQL updates (queries are anonymous)
+        self.username = os.getenv('FUSEKI_USERNAME')
+        self.password = os.getenv('FUSEKI_PASSWORD')
+        # Whether sfia:skillCount triples exist (None until get_all_categories checks)
+        self._category_counts_stored = None
         
         # Common prefixes used in SFIA 9 ontology
         # Note: SFIA 9 uses skos:notation for skill codes, not sfia:code
@@ -51,19 +182,143 @@ class SFIAKnowledgeService:
         PREFIX owl: <http://www.w3.org/2002/07/owl#>
         """
         
+        # Cache namespaces are scoped to the endpoint, so services pointed at other
+        # Fuseki servers or datasets never read each other's entries
+        self._cache_scope = hashlib.blake2b(self.endpoint.encode('utf-8'), digest_size=6).hexdigest()
+        
+        # Shared cache for deterministic lookups (skill search, skill detail)
+        self._cache = get_cache(f'sfia:{self._cache_scope}', maxsize=4096)
+        # Counts change only when the KG is reloaded, but should not go stale for long
+        self._stats_cache = get_cache(f'sfia_stats:{self._cache_scope}', maxsize=1, ttl=int(os.getenv('KG_STATS_CACHE_TTL', '300')))
+        # Raw results of list queries, which have no lookup-level cache (0 disables);
+        # one namespace per query group so a group can be invalidated as a whole
+        self._query_cache_ttl = int(os.getenv('KG_QUERY_CACHE_TTL', '600'))
+        
+        # Pooled keep-alive HTTP client for SPARQL requests (SPARQLWrapper opens a
+        # new connection per query and is only used when httpx is unavailable)
+        self._max_connections = max_connections or int(os.getenv('KG_MAX_CONNECTIONS', '32'))
+        self._max_keepalive = max_keepalive or int(os.getenv('KG_MAX_KEEPALIVE', '16'))
+        self._http = None
+        if HTTPX_AVAILABLE:
+            self._http = httpx.Client(
+                timeout=self.timeout,
+                transport=httpx.HTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=self._max_connections,
+                        max_keepalive_connections=self._max_keepalive
+                    ),
+                    # Retries cover failed connection attempts only, never a sent query
+                    retries=int(os.getenv('KG_CONNECT_RETRIES', '3'))
+                )
+            )
+        # Async clients are bound to the event loop that created them, so each loop gets its own
+        self._async_http = weakref.WeakKeyDictionary()
+        
         # Validate connection on first instantiation
         if self.enabled and not SFIAKnowledgeService._connection_validated:
             self._validate_connection()
     
+    def close(self):
+        """Close pooled HTTP connections to Fuseki"""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        self._async_http.clear()
+    
+    def _run_query(self, query, result_format=JSON):
+        """
+        Send a SPARQL query to Fuseki and parse the results
+        
+        Args:
+            query: SPARQL query string
+            result_format: JSON, or TSV for large lists (parsed into the same structure)
+            
+        Returns:
+            Query results as dictionary
+            
+        Raises:
+            Exception: On connection, HTTP or parse errors
+        """
+        if self._http is not None:
+            response = self._http.request(**self._http_request(query, result_format))
+            response.raise_for_status()
+            if result_format == TSV:
+                return _parse_tsv_results(response.text)
+            if ORJSON_AVAILABLE:
+                return orjson.loads(response.content)
+            return response.json()
+        
+        sparql = SPARQLWrapper(self.endpoint)
+        sparql.setTimeout(self.timeout)
+        sparql.setQuery(_prune_prefixes(query))
+        sparql.setReturnFormat(result_format)
+        response = sparql.query()
+        if result_format == TSV:
+            return _parse_tsv_results(response.response.read().decode('utf-8'))
+        if ORJSON_AVAILABLE:
+            # Parse the raw bytes directly; faster than convert()'s decode + json.loads
+            return orjson.loads(response.response.read())
+        return response.convert()
+    
+    def _http_request(self, query, result_format):
+        """
+        Build the HTTP request for a SPARQL query
+        
+        Unused prefixes are dropped, and short queries are sent as GET (cacheable by
+        HTTP caches in front of Fuseki); longer ones are POSTed form-encoded.
+        httpx requests gzip-compressed responses by default.
+        
+        Args:
+            query: SPARQL query string
+            result_format: JSON or TSV
+            
+        Returns:
+            Keyword arguments for httpx request()
+        """
+        query = _prune_prefixes(query)
+        request = {
+            'url': self.endpoint,
+            'headers': {'Accept': _RESULT_MEDIA_TYPES[result_format]}
+        }
+        if len(query) <= _GET_QUERY_MAX_LENGTH:
+            return {**request, 'method': 'GET', 'params': {'query': query}}
+        return {**request, 'method': 'POST', 'data': {'query': query}}
+    
+    def _get_async_http(self):
+        """Get the pooled async HTTP client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._async_http.get(loop)
+        if client is None:
+            client = self._async_http[loop] = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=self._max_connections,
+                        max_keepalive_connections=self._max_keepalive
+                    ),
+                    retries=int(os.getenv('KG_CONNECT_RETRIES', '3'))
+                )
+            )
+        return client
+    
+    async def _arun_query(self, query, result_format=JSON):
+        """Async variant of _run_query (runs _run_query in a thread without httpx)"""
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self._run_query, query, result_format)
+        
+        response = await self._get_async_http().request(**self._http_request(query, result_format))
+        response.raise_for_status()
+        if result_format == TSV:
+            return _parse_tsv_results(response.text)
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
+    
     def _validate_connection(self):
         """Test connection to Fuseki and log status"""
         try:
             test_query = "SELECT (1 as ?test) WHERE {}"
-            sparql = SPARQLWrapper(self.endpoint)
-            sparql.setTimeout(self.timeout)
-            sparql.setQuery(test_query)
-            sparql.setReturnFormat(JSON)
-            sparql.query().convert()
+            self._run_query(test_query)
             
             SFIAKnowledgeService._connection_validated = True
             logger.info(f"✅ Knowledge Graph connected: {self.endpoint}")
@@ -80,12 +335,15 @@ class SFIAKnowledgeService:
             return False
         return SFIAKnowledgeService._connection_validated
     
-    def _execute_query(self, query):
+    def _execute_query(self, query, result_format=JSON, cache_group=None):
         """
         Execute a SPARQL query with error handling
         
         Args:
             query: SPARQL query string
+            result_format: JSON, or TSV for large lists (parsed into the same structure)
+            cache_group: Query group whose results are cached (None for queries
+                         behind a lookup-level cache)
             
         Returns:
             Query results as dictionary
@@ -94,18 +352,76 @@ class SFIAKnowledgeService:
             logger.debug("KG disabled, returning empty results")
             return {'results': {'bindings': []}}
         
+        query_cache = self._query_cache(cache_group)
+        cache_key = None
+        if query_cache is not None:
+            cache_key = _query_cache_key(query, result_format)
+            cached = query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            sparql = SPARQLWrapper(self.endpoint)
-            sparql.setTimeout(self.timeout)
-            sparql.setQuery(query)
-            sparql.setReturnFormat(JSON)
-            results = sparql.query().convert()
-            return results
+            result = self._run_query(query, result_format)
+            if cache_key is not None:
+                query_cache.set(cache_key, result)
+            return result
         except Exception as e:
             logger.error(f"SPARQL query error: {str(e)}")
             # Return empty results instead of raising to allow fallback
             return {'results': {'bindings': []}}
     
+    async def _aexecute_query(self, query, result_format=JSON, cache_group=None):
+        """
+        Async variant of _execute_query
+        
+        Args:
+            query: SPARQL query string
+            result_format: JSON, or TSV for large lists (parsed into the same structure)
+            cache_group: Query group whose results are cached (None for queries
+                         behind a lookup-level cache)
+            
+        Returns:
+            Query results as dictionary
+        """
+        if not self.enabled:
+            logger.debug("KG disabled, returning empty results")
+            return {'results': {'bindings': []}}
+        
+        query_cache = self._query_cache(cache_group)
+        cache_key = None
+        if query_cache is not None:
+            cache_key = _query_cache_key(query, result_format)
+            cached = query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            result = await self._arun_query(query, result_format)
+            if cache_key is not None:
+                query_cache.set(cache_key, result)
+            return result
+        except Exception as e:
+            logger.error(f"SPARQL query error: {str(e)}")
+            return {'results': {'bindings': []}}
+    
+    def _query_cache(self, cache_group):
+        """Get the raw result cache for a query group (None when uncached)"""
+        if cache_group is None or self._query_cache_ttl <= 0:
+            return None
+        return get_cache(f'sparql:{self._cache_scope}:{cache_group}', maxsize=256, ttl=self._query_cache_ttl)
+    
+    async def aexecute_many(self, queries):
+        """
+        Run independent SPARQL queries concurrently
+        
+        Args:
+            queries: List of SPARQL query strings
+            
+        Returns:
+            List of query results, in the same order as queries
+        """
+        return await asyncio.gather(*(self._aexecute_query(query) for query in queries))
+    
     def get_all_skills(self, limit=None, offset=None):
         """
         Get all SFIA skills
@@ -117,14 +433,30 @@ class SFIAKnowledgeService:
         Returns:
             List of skills with basic information
         """
+        # Paginate distinct skills in a subquery: a skill with several categories or
+        # descriptions spans several rows, so LIMIT on the joined rows would split it
+        # across pages. ?skill breaks label ties so pages are stable.
+        page = ""
+        if limit:
+            page += f"\n                LIMIT {int(limit)}"
+        if offset:
+            page += f"\n                OFFSET {int(offset)}"
+        
         query = f"""
         {self.prefixes}
         
         SELECT ?skill ?code ?label ?description ?category
         WHERE {{
-            ?skill a sfia:Skill ;
-                   skos:notation ?code ;
-                   rdfs:label ?label .
+            {{
+                SELECT DISTINCT ?skill ?label
+                WHERE {{
+                    ?skill a sfia:Skill ;
+                           rdfs:label ?label .
+                }}
+                ORDER BY ?label ?skill{page}
+            }}
+            
+            ?skill skos:notation ?code .
             
             OPTIONAL {{ ?skill sfia:description ?description }}
             OPTIONAL {{ 
@@ -132,15 +464,10 @@ class SFIAKnowledgeService:
                 ?categoryUri rdfs:label ?category 
             }}
         }}
-        ORDER BY ?label
+        ORDER BY ?label ?skill
         """
         
-        if limit:
-            query += f"\nLIMIT {limit}"
-        if offset:
-            query += f"\nOFFSET {offset}"
-        
-        result = self._execute_query(query)
+        result = self._execute_query(query, result_format=TSV, cache_group='skills')
         return self._format_skills_list(result)
     
     def _format_skills_list(self, result):
@@ -149,15 +476,15 @@ class SFIAKnowledgeService:
         seen_codes = set()
         
         for binding in result.get('results', {}).get('bindings', []):
-            code = binding.get('code', {}).get('value', '')
+            code = _v(binding, 'code')
             if code and code not in seen_codes:
                 seen_codes.add(code)
                 skills.append({
                     'code': code,
-                    'name': binding.get('label', {}).get('value', ''),
-                    'category': binding.get('category', {}).get('value', ''),
-                    'description': binding.get('description', {}).get('value', '')[:200] if binding.get('description', {}).get('value') else '',
-                    'uri': binding.get('skill', {}).get('value', '')
+                    'name': _v(binding, 'label'),
+                    'category': _v(binding, 'category'),
+                    'description': _v(binding, 'description')[:200],
+                    'uri': _v(binding, 'skill')
                 })
         
         return skills
@@ -172,18 +499,26 @@ class SFIAKnowledgeService:
         Returns:
             Detailed skill information including all levels
         """
+        cache_key = f"skill:{skill_code}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return {**cached, 'levels': _int_keys(cached['levels'])}
+        
         query = f"""
         {self.prefixes}
         
-        SELECT ?skill ?code ?label ?description ?category ?url
-               ?levelNumber ?levelDescription
+        SELECT ?skill ?code ?label
+               (SAMPLE(?description) as ?skillDescription)
+               (SAMPLE(?category) as ?skillCategory)
+               (SAMPLE(?url) as ?skillUrl)
+               (GROUP_CONCAT(DISTINCT CONCAT(STR(?levelNumber), "|", ?levelDescription); separator="{_LEVEL_SEPARATOR_ESCAPE}") as ?levels)
         WHERE {{
+            VALUES ?code {{ {_sparql_literal(skill_code)} }}
+            
             ?skill a sfia:Skill ;
-                   skos:notation "{skill_code}" ;
+                   skos:notation ?code ;
                    rdfs:label ?label .
             
-            BIND("{skill_code}" as ?code)
-            
             OPTIONAL {{ ?skill sfia:description ?description }}
             OPTIONAL {{ ?skill sfia:url ?url }}
             OPTIONAL {{ 
@@ -198,11 +533,14 @@ class SFIAKnowledgeService:
                 ?skillLevel sfia:description ?levelDescription .
             }}
         }}
-        ORDER BY ?levelNumber
+        GROUP BY ?skill ?code ?label
         """
         
         result = self._execute_query(query)
-        return self._format_skill_detail(result, skill_code)
+        skill = self._format_skill_detail(result, skill_code)
+        if skill:
+            self._cache.set(cache_key, skill)
+        return skill
     
     def _format_skill_detail(self, result, skill_code):
         """Format SPARQL result into a detailed skill object"""
@@ -214,19 +552,20 @@ class SFIAKnowledgeService:
         first = bindings[0]
         skill = {
             'code': skill_code,
-            'name': first.get('label', {}).get('value', ''),
-            'description': first.get('description', {}).get('value', ''),
-            'category': first.get('category', {}).get('value', ''),
-            'url': first.get('url', {}).get('value', ''),
+            'name': _v(first, 'label'),
+            'description': _v(first, 'skillDescription'),
+            'category': _v(first, 'skillCategory'),
+            'url': _v(first, 'skillUrl'),
             'levels': {}
         }
         
-        # Collect levels
-        for binding in bindings:
-            level_num = binding.get('levelNumber', {}).get('value')
-            level_desc = binding.get('levelDescription', {}).get('value')
+        # Levels arrive as one "number|description" string per level
+        levels = {}
+        for entry in _v(first, 'levels').split(_LEVEL_SEPARATOR):
+            level_num, _, level_desc = entry.partition('|')
             if level_num and level_desc:
-                skill['levels'][int(level_num)] = level_desc
+                levels[int(level_num)] = level_desc
+        skill['levels'] = dict(sorted(levels.items()))
         
         return skill
     
@@ -241,19 +580,130 @@ class SFIAKnowledgeService:
         Returns:
             List of matching skills
         """
+        cache_key = self._search_cache_key(keyword, limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # First try smart search with relevance scoring
         results = self.smart_search_skills(keyword, limit)
+        if not results:
+            # Fallback to basic substring search
+            results = self._basic_search_skills(keyword, limit)
+        
+        # Empty results may come from a failed query, so only cache hits
         if results:
-            return results
+            self._cache.set(cache_key, results)
+        return results
+    
+    def search_skills_batch(self, keywords, limit=50):
+        """
+        Search skills for several keywords
+        
+        Every keyword is scored against the same cached skill catalogue, and
+        keywords smart search cannot match share one basic-search query, so a
+        batch costs at most two SPARQL round-trips.
+        
+        Args:
+            keywords: Iterable of search keywords
+            limit: Maximum number of results per keyword
+            
+        Returns:
+            Dictionary of {keyword: list of matching skills}
+        """
+        results = {}
+        unmatched = []
+        
+        for keyword in dict.fromkeys(keywords):
+            cache_key = self._search_cache_key(keyword, limit)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                results[keyword] = cached
+                continue
+            
+            matches = self.smart_search_skills(keyword, limit)
+            if matches:
+                self._cache.set(cache_key, matches)
+            else:
+                unmatched.append(keyword)
+            results[keyword] = matches
+        
+        if unmatched:
+            for keyword, matches in self._basic_search_skills_batch(unmatched, limit).items():
+                if matches:
+                    self._cache.set(self._search_cache_key(keyword, limit), matches)
+                results[keyword] = matches
+        
+        return results
+    
+    def _search_cache_key(self, keyword, limit):
+        """Cache key for a keyword search"""
+        digest = hashlib.sha1(keyword.strip().lower().encode('utf-8')).hexdigest()
+        return f"search:{digest}:{limit}"
+    
+    def warm_cache(self):
+        """
+        Prefetch the skill catalogue so the first searches are served locally
+        
+        Returns:
+            Number of skills in the catalogue (0 if the query failed)
+        """
+        return len(self.get_skill_catalogue())
+    
+    def get_skill_catalogue(self):
+        """
+        Get every skill with the lowercased text fields smart search scores against
+        
+        The catalogue is the same for every keyword, so it is fetched with one
+        query and cached rather than re-read from the KG per search.
         
-        # Fallback to basic regex search
-        return self._basic_search_skills(keyword, limit)
+        Returns:
+            List of {'code', 'name', 'category', 'label', 'description', 'notes'}
+            where label, description and notes are lowercased
+        """
+        cached = self._cache.get('catalogue')
+        if cached is not None:
+            return cached
+        
+        query = f"""
+        {self.prefixes}
+        
+        SELECT DISTINCT ?skill ?code ?label ?category ?description ?notes
+        WHERE {{
+            ?skill a sfia:Skill ;
+                   skos:notation ?code ;
+                   rdfs:label ?label .
+            
+            OPTIONAL {{ 
+                ?skill sfia:skillCategory ?categoryUri .
+                ?categoryUri rdfs:label ?category 
+            }}
+            OPTIONAL {{ ?skill sfia:skillDescription ?description }}
+            OPTIONAL {{ ?skill sfia:skillNotes ?notes }}
+        }}
+        """
+        
+        result = self._execute_query(query)
+        catalogue = [
+            {
+                'code': _v(binding, 'code'),
+                'name': _v(binding, 'label'),
+                'category': _v(binding, 'category'),
+                'label': _v(binding, 'label').lower(),
+                'description': _v(binding, 'description').lower(),
+                'notes': _v(binding, 'notes').lower(),
+            }
+            for binding in result.get('results', {}).get('bindings', [])
+        ]
+        
+        # An empty catalogue means the query failed, so never cache it
+        if catalogue:
+            self._cache.set('catalogue', catalogue)
+        return catalogue
     
     def _basic_search_skills(self, keyword, limit=50):
-        """Basic regex-based skill search (fallback)"""
-        import re as regex_module
-        safe_keyword = regex_module.sub(r'[^a-zA-Z0-9\s\-]', '', keyword)
-        safe_keyword = safe_keyword.strip()
+        """Basic substring skill search (fallback)"""
+        safe_keyword = _UNSAFE_KEYWORD_CHARS.sub('', keyword).strip()
         
         if not safe_keyword:
             return []
@@ -263,6 +713,8 @@ class SFIAKnowledgeService:
         
         SELECT DISTINCT ?skill ?code ?label ?category ?description
         WHERE {{
+            VALUES ?kw {{ {_sparql_literal(safe_keyword.lower())} }}
+            
             ?skill a sfia:Skill ;
                    skos:notation ?code ;
                    rdfs:label ?label .
@@ -275,19 +727,85 @@ class SFIAKnowledgeService:
             OPTIONAL {{ ?skill sfia:skillNotes ?notes }}
             
             FILTER (
-                regex(?label, "{safe_keyword}", "i") ||
-                regex(?description, "{safe_keyword}", "i") ||
-                regex(?notes, "{safe_keyword}", "i") ||
-                regex(?code, "{safe_keyword}", "i")
+                CONTAINS(LCASE(?label), ?kw) ||
+                CONTAINS(LCASE(?description), ?kw) ||
+                CONTAINS(LCASE(?notes), ?kw) ||
+                CONTAINS(LCASE(?code), ?kw)
             )
         }}
         ORDER BY ?label
-        LIMIT {limit}
+        LIMIT {int(limit)}
         """
         
         result = self._execute_query(query)
         return self._format_search_results(result)
     
+    def _basic_search_skills_batch(self, keywords, limit=50):
+        """
+        Basic substring skill search for several keywords in one query (fallback)
+        
+        Args:
+            keywords: List of search keywords
+            limit: Maximum number of results per keyword
+            
+        Returns:
+            Dictionary of {keyword: list of matching skills}
+        """
+        # Keywords that sanitize to the same pattern share its results
+        keywords_by_pattern = {}
+        for keyword in keywords:
+            safe_keyword = _UNSAFE_KEYWORD_CHARS.sub('', keyword).strip().lower()
+            if safe_keyword:
+                keywords_by_pattern.setdefault(safe_keyword, []).append(keyword)
+        
+        results = {keyword: [] for keyword in keywords}
+        if not keywords_by_pattern:
+            return results
+        
+        values = ' '.join(_sparql_literal(pattern) for pattern in keywords_by_pattern)
+        query = f"""
+        {self.prefixes}
+        
+        SELECT DISTINCT ?kw ?skill ?code ?label ?category ?description
+        WHERE {{
+            VALUES ?kw {{ {values} }}
+            ?skill a sfia:Skill ;
+                   skos:notation ?code ;
+                   rdfs:label ?label .
+            
+            OPTIONAL {{ 
+                ?skill sfia:skillCategory ?categoryUri .
+                ?categoryUri rdfs:label ?category 
+            }}
+            OPTIONAL {{ ?skill sfia:skillDescription ?description }}
+            OPTIONAL {{ ?skill sfia:skillNotes ?notes }}
+            
+            FILTER (
+                CONTAINS(LCASE(?label), ?kw) ||
+                CONTAINS(LCASE(?description), ?kw) ||
+                CONTAINS(LCASE(?notes), ?kw) ||
+                CONTAINS(LCASE(?code), ?kw)
+            )
+        }}
+        ORDER BY ?kw ?label
+        """
+        
+        result = self._execute_query(query)
+        
+        # Apply the per-keyword limit locally, as LIMIT would for a single keyword
+        bindings_by_pattern = {pattern: [] for pattern in keywords_by_pattern}
+        for binding in result.get('results', {}).get('bindings', []):
+            rows = bindings_by_pattern.get(_v(binding, 'kw'))
+            if rows is not None and len(rows) < limit:
+                rows.append(binding)
+        
+        for pattern, rows in bindings_by_pattern.items():
+            matches = self._format_search_results({'results': {'bindings': rows}})
+            for keyword in keywords_by_pattern[pattern]:
+                results[keyword] = matches
+        
+        return results
+    
     def smart_search_skills(self, keyword, limit=10):
         """
         Smart skill search with relevance scoring and keyword mapping
@@ -304,23 +822,26 @@ class SFIAKnowledgeService:
         Returns:
             List of matching skills sorted by relevance
         """
-        import re as regex_module
-        
         # Clean keyword
-        clean_keyword = regex_module.sub(r'[^a-zA-Z0-9\s\-]', '', keyword.strip().lower())
+        clean_keyword = _UNSAFE_KEYWORD_CHARS.sub('', keyword.strip().lower())
         if not clean_keyword:
             return []
         
+        # Whole-word pattern is compiled once and reused for every binding
+        word_pattern = re.compile(r'\b' + re.escape(clean_keyword) + r'\b')
+        
         # Check keyword mapping first for direct matches
         mapped_codes = self._get_mapped_skill_codes(clean_keyword)
         
         # Get all potential matches from KG
         all_matches = []
+        matched_codes = set()
         
         # If we have mapped codes, get those skills first
         for code in mapped_codes:
             skill = self.get_skill_by_code(code)
             if skill:
+                matched_codes.add(skill['code'])
                 all_matches.append({
                     'code': skill['code'],
                     'name': skill['name'],
@@ -331,37 +852,18 @@ class SFIAKnowledgeService:
                 })
         
         # Search by keyword in label and description
-        query = f"""
-        {self.prefixes}
-        
-        SELECT DISTINCT ?skill ?code ?label ?category ?description ?notes
-        WHERE {{
-            ?skill a sfia:Skill ;
-                   skos:notation ?code ;
-                   rdfs:label ?label .
-            
-            OPTIONAL {{ 
-                ?skill sfia:skillCategory ?categoryUri .
-                ?categoryUri rdfs:label ?category 
-            }}
-            OPTIONAL {{ ?skill sfia:skillDescription ?description }}
-            OPTIONAL {{ ?skill sfia:skillNotes ?notes }}
-        }}
-        """
-        
-        result = self._execute_query(query)
-        
         # Score each skill based on relevance
-        for binding in result.get('results', {}).get('bindings', []):
-            code = binding.get('code', {}).get('value', '')
-            label = binding.get('label', {}).get('value', '').lower()
-            desc = binding.get('description', {}).get('value', '').lower() if binding.get('description') else ''
-            notes = binding.get('notes', {}).get('value', '').lower() if binding.get('notes') else ''
+        for entry in self.get_skill_catalogue():
+            code = entry['code']
             
             # Skip if already in results
-            if any(m['code'] == code for m in all_matches):
+            if code in matched_codes:
                 continue
             
+            label = entry['label']
+            desc = entry['description']
+            notes = entry['notes']
+            
             # Calculate relevance score
             score = 0
             match_type = None
@@ -375,7 +877,7 @@ class SFIAKnowledgeService:
                 score = 85
                 match_type = 'label_prefix'
             # Label contains keyword as whole word
-            elif regex_module.search(r'\b' + regex_module.escape(clean_keyword) + r'\b', label):
+            elif word_pattern.search(label):
                 score = 75
                 match_type = 'label_word'
             # Label contains keyword
@@ -387,11 +889,11 @@ class SFIAKnowledgeService:
                 score = 90
                 match_type = 'exact_code'
             # Description contains keyword as whole word
-            elif desc and regex_module.search(r'\b' + regex_module.escape(clean_keyword) + r'\b', desc):
+            elif desc and word_pattern.search(desc):
                 score = 50
                 match_type = 'description'
             # Notes contains keyword
-            elif notes and regex_module.search(r'\b' + regex_module.escape(clean_keyword) + r'\b', notes):
+            elif notes and word_pattern.search(notes):
                 score = 40
                 match_type = 'notes'
             # Partial match in description
@@ -400,10 +902,11 @@ class SFIAKnowledgeService:
                 match_type = 'description_partial'
             
             if score > 0:
+                matched_codes.add(code)
                 all_matches.append({
                     'code': code,
-                    'name': binding.get('label', {}).get('value', ''),
-                    'category': binding.get('category', {}).get('value', ''),
+                    'name': entry['name'],
+                    'category': entry['category'],
                     'description': desc[:200] + '...' if len(desc) > 200 else desc,
                     'score': score,
                     'match_type': match_type
@@ -539,14 +1042,14 @@ class SFIAKnowledgeService:
         seen_codes = set()
         
         for binding in result.get('results', {}).get('bindings', []):
-            code = binding.get('code', {}).get('value', '')
+            code = _v(binding, 'code')
             if code and code not in seen_codes:
                 seen_codes.add(code)
-                desc = binding.get('description', {}).get('value', '')
+                desc = _v(binding, 'description')
                 skills.append({
                     'code': code,
-                    'name': binding.get('label', {}).get('value', ''),
-                    'category': binding.get('category', {}).get('value', ''),
+                    'name': _v(binding, 'label'),
+                    'category': _v(binding, 'category'),
                     'description': desc[:200] + '...' if len(desc) > 200 else desc
                 })
         
@@ -567,20 +1070,22 @@ class SFIAKnowledgeService:
         
         SELECT ?skill ?code ?label ?description
         WHERE {{
+            VALUES ?categoryName {{ {_sparql_literal(category_name.lower())} }}
+            
             ?skill a sfia:Skill ;
                    skos:notation ?code ;
                    rdfs:label ?label ;
                    sfia:inCategory ?categoryUri .
             
             ?categoryUri rdfs:label ?categoryLabel .
-            FILTER (regex(?categoryLabel, "{category_name}", "i"))
+            FILTER (CONTAINS(LCASE(?categoryLabel), ?categoryName))
             
             OPTIONAL {{ ?skill sfia:description ?description }}
         }}
         ORDER BY ?label
         """
         
-        result = self._execute_query(query)
+        result = self._execute_query(query, result_format=TSV, cache_group='skills')
         return self._format_skills_list(result)
     
     def get_skills_by_level(self, level_number):
@@ -603,8 +1108,10 @@ class SFIAKnowledgeService:
                    rdfs:label ?label ;
                    sfia:definedAtLevel ?skillLevel .
             
+            VALUES ?levelNumber {{ {int(level_number)} }}
+            
             ?skillLevel sfia:atLevel ?levelUri .
-            ?levelUri sfia:levelNumber {level_number} .
+            ?levelUri sfia:levelNumber ?levelNumber .
             
             OPTIONAL {{ 
                 ?skill sfia:inCategory ?categoryUri .
@@ -614,17 +1121,75 @@ class SFIAKnowledgeService:
         ORDER BY ?category ?label
         """
         
-        result = self._execute_query(query)
+        result = self._execute_query(query, cache_group='skills')
         return self._format_skills_list(result)
     
     def get_all_categories(self):
         """
         Get all SFIA categories
         
+        Skill counts are read from sfia:skillCount triples stored by
+        refresh_category_counts(); without them, they are aggregated per call.
+        Whether the graph holds stored counts is checked once per service.
+        
         Returns:
             List of categories
         """
-        query = f"""
+        if self._category_counts_stored is None:
+            self._category_counts_stored = self._has_stored_category_counts()
+        
+        if self._category_counts_stored:
+            result = self._execute_query(self._stored_category_counts_query(), result_format=TSV, cache_group='categories')
+            bindings = result.get('results', {}).get('bindings', [])
+            if any('skillCount' not in binding for binding in bindings):
+                # The graph was re-imported without a refresh; aggregate from now on
+                self._category_counts_stored = False
+        
+        if not self._category_counts_stored:
+            result = self._execute_query(self._category_counts_query(), result_format=TSV, cache_group='categories')
+            bindings = result.get('results', {}).get('bindings', [])
+        
+        categories = []
+        for binding in bindings:
+            categories.append({
+                'name': _v(binding, 'label'),
+                'uri': _v(binding, 'category'),
+                'skill_count': int(_v(binding, 'skillCount', 0))
+            })
+        
+        return categories
+    
+    def _has_stored_category_counts(self):
+        """Check whether refresh_category_counts() has run (None if the check failed)"""
+        result = self._execute_query(self._category_counts_probe_query(), cache_group='categories')
+        return result.get('boolean')
+    
+    def _category_counts_probe_query(self):
+        """ASK whether any category has a stored skill count"""
+        return f"""
+        {self.prefixes}
+        
+        ASK {{ ?category sfia:skillCount ?skillCount }}
+        """
+    
+    def _stored_category_counts_query(self):
+        """Categories with the skill counts stored by refresh_category_counts()"""
+        return f"""
+        {self.prefixes}
+        
+        SELECT ?category ?label ?skillCount
+        WHERE {{
+            ?category a sfia:Category ;
+                     rdfs:label ?label .
+            
+            OPTIONAL {{ ?category sfia:skillCount ?skillCount }}
+        }}
+        ORDER BY ?label
+        """
+    
+    def _category_counts_query(self):
+        """Aggregate skill counts per category (used until counts are materialized)"""
+        return f"""
         {self.prefixes}
         
         SELECT DISTINCT ?category ?label (COUNT(DISTINCT ?skill) as ?skillCount)
@@ -639,18 +1204,78 @@ class SFIAKnowledgeService:
         GROUP BY ?category ?label
         ORDER BY ?label
         """
+    
+    def refresh_category_counts(self):
+        """
+        Store each category's skill count in the graph as sfia:skillCount
         
-        result = self._execute_query(query)
-        categories = []
+        The SFIA graph only changes on re-import, so run this once after loading it;
+        get_all_categories then reads the counts instead of grouping every skill.
+        The cached category query group is purged from the shared (Redis/disk) tier, but
+        running API processes keep their in-process copies until KG_QUERY_CACHE_TTL
+        expires, and those that already found no stored counts keep aggregating
+        (with the same results) until restarted.
         
-        for binding in result.get('results', {}).get('bindings', []):
-            categories.append({
-                'name': binding.get('label', {}).get('value', ''),
-                'uri': binding.get('category', {}).get('value', ''),
-                'skill_count': int(binding.get('skillCount', {}).get('value', 0))
-            })
+        Returns:
+            True if the update succeeded
+        """
+        if not self.enabled:
+            logger.error("❌ Cannot refresh category counts: knowledge graph is not connected")
+            return False
         
-        return categories
+        update = f"""
+        {self.prefixes}
+        
+        DELETE {{ ?category sfia:skillCount ?old }}
+        WHERE {{ ?category sfia:skillCount ?old }} ;
+        
+        INSERT {{ ?category sfia:skillCount ?count }}
+        WHERE {{
+            SELECT ?category (COUNT(DISTINCT ?skill) as ?count)
+            WHERE {{
+                ?category a sfia:Category .
+                OPTIONAL {{ ?skill sfia:inCategory ?category }}
+            }}
+            GROUP BY ?category
+        }}
+        """
+        
+        try:
+            self._run_update(update)
+        except Exception as e:
+            logger.error(f"❌ Failed to refresh category counts: {str(e)}")
+            return False
+        
+        query_cache = self._query_cache('categories')
+        if query_cache is not None:
+            query_cache.purge()
+        self._category_counts_stored = True
+        logger.info("✅ Category skill counts refreshed")
+        return True
+    
+    def _run_update(self, update):
+        """
+        Send a SPARQL update to Fuseki
+        
+        Args:
+            update: SPARQL update string
+            
+        Raises:
+            Exception: On connection or HTTP errors
+        """
+        auth = (self.username, self.password) if self.username else None
+        if self._http is not None:
+            response = self._http.post(self.update_endpoint, data={'update': update}, auth=auth)
+            response.raise_for_status()
+            return
+        
+        sparql = SPARQLWrapper(self.update_endpoint)
+        sparql.setTimeout(self.timeout)
+        sparql.setMethod(POST)
+        if auth:
+            sparql.setCredentials(*auth)
+        sparql.setQuery(update)
+        sparql.query()
     
     def get_all_levels(self):
         """
@@ -673,14 +1298,14 @@ class SFIAKnowledgeService:
         ORDER BY ?levelNumber
         """
         
-        result = self._execute_query(query)
+        result = self._execute_query(query, result_format=TSV, cache_group='levels')
         levels = []
         
         for binding in result.get('results', {}).get('bindings', []):
             levels.append({
-                'number': int(binding.get('levelNumber', {}).get('value', 0)),
-                'name': binding.get('label', {}).get('value', ''),
-                'description': binding.get('description', {}).get('value', '')
+                'number': int(_v(binding, 'levelNumber', 0)),
+                'name': _v(binding, 'label'),
+                'description': _v(binding, 'description')
             })
         
         return levels
@@ -695,13 +1320,20 @@ class SFIAKnowledgeService:
         Returns:
             Detailed level information for the skill
         """
+        cache_key = f"levels:{skill_code}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return _int_keys(cached)
+        
         query = f"""
         {self.prefixes}
         
         SELECT ?levelNumber ?description
         WHERE {{
+            VALUES ?code {{ {_sparql_literal(skill_code)} }}
+            
             ?skill a sfia:Skill ;
-                   skos:notation "{skill_code}" ;
+                   skos:notation ?code ;
                    sfia:definedAtLevel ?skillLevel .
             
             ?skillLevel sfia:atLevel ?levelUri ;
@@ -715,13 +1347,118 @@ class SFIAKnowledgeService:
         levels = {}
         
         for binding in result.get('results', {}).get('bindings', []):
-            level_num = int(binding.get('levelNumber', {}).get('value', 0))
+            level_num = int(_v(binding, 'levelNumber', 0))
             levels[level_num] = {
-                'description': binding.get('description', {}).get('value', ''),
+                'description': _v(binding, 'description'),
             }
         
+        if levels:
+            self._cache.set(cache_key, levels)
         return levels
     
+    def get_skill_levels_detail_batch(self, skill_codes):
+        """
+        Get detailed level descriptions for several skills in one query
+        
+        Args:
+            skill_codes: Iterable of SFIA skill codes
+            
+        Returns:
+            Dictionary of {skill_code: {level_number: {'description': ...}}};
+            codes without level data map to an empty dictionary
+        """
+        codes = list(dict.fromkeys(code for code in skill_codes if code))
+        levels_by_code = {}
+        
+        # Only query codes whose levels are not cached (shared with get_skill_levels_detail)
+        missing = []
+        for code in codes:
+            cached = self._cache.get(f"levels:{code}")
+            if cached is not None:
+                levels_by_code[code] = _int_keys(cached)
+            else:
+                missing.append(code)
+        if not missing:
+            return levels_by_code
+        
+        values = ' '.join(_sparql_literal(code) for code in missing)
+        query = f"""
+        {self.prefixes}
+        
+        SELECT ?code ?levelNumber ?description
+        WHERE {{
+            VALUES ?code {{ {values} }}
+            ?skill a sfia:Skill ;
+                   skos:notation ?code ;
+                   sfia:definedAtLevel ?skillLevel .
+            
+            ?skillLevel sfia:atLevel ?levelUri ;
+                       sfia:description ?description .
+            ?levelUri sfia:levelNumber ?levelNumber .
+        }}
+        ORDER BY ?code ?levelNumber
+        """
+        
+        result = self._execute_query(query)
+        fetched = {code: {} for code in missing}
+        
+        for binding in result.get('results', {}).get('bindings', []):
+            code = _v(binding, 'code')
+            level_num = int(_v(binding, 'levelNumber', 0))
+            fetched.setdefault(code, {})[level_num] = {
+                'description': _v(binding, 'description'),
+            }
+        
+        for code, levels in fetched.items():
+            if levels:
+                self._cache.set(f"levels:{code}", levels)
+        levels_by_code.update(fetched)
+        
+        return levels_by_code
+    
+    def get_all_skill_levels_detail(self):
+        """
+        Get level descriptions for every skill in one query
+        
+        SFIA level descriptions are static reference data, so callers can load
+        the whole map once and index it locally instead of querying per skill.
+        
+        Returns:
+            Dictionary of {skill_code: {level_number: {'description': ...}}}
+        """
+        cached = self._cache.get("all_levels")
+        if cached is not None:
+            return {code: _int_keys(levels) for code, levels in cached.items()}
+        
+        query = f"""
+        {self.prefixes}
+        
+        SELECT ?code ?levelNumber ?description
+        WHERE {{
+            ?skill a sfia:Skill ;
+                   skos:notation ?code ;
+                   sfia:definedAtLevel ?skillLevel .
+            
+            ?skillLevel sfia:atLevel ?levelUri ;
+                       sfia:description ?description .
+            ?levelUri sfia:levelNumber ?levelNumber .
+        }}
+        """
+        
+        result = self._execute_query(query)
+        levels_by_code = {}
+        
+        for binding in result.get('results', {}).get('bindings', []):
+            code = _v(binding, 'code')
+            level_num = int(_v(binding, 'levelNumber', 0))
+            levels_by_code.setdefault(code, {})[level_num] = {
+                'description': _v(binding, 'description'),
+            }
+        
+        if levels_by_code:
+            self._cache.set("all_levels", levels_by_code)
+        return levels_by_code
+    
     def get_related_skills(self, skill_code, limit=10):
         """
         Get skills related to a given skill (same category)
@@ -738,8 +1475,10 @@ class SFIAKnowledgeService:
         
         SELECT DISTINCT ?relatedSkill ?code ?label
         WHERE {{
+            VALUES ?skillCode {{ {_sparql_literal(skill_code)} }}
+            
             ?skill a sfia:Skill ;
-                   skos:notation "{skill_code}" ;
+                   skos:notation ?skillCode ;
                    sfia:inCategory ?category .
             
             ?relatedSkill a sfia:Skill ;
@@ -750,24 +1489,28 @@ class SFIAKnowledgeService:
             FILTER (?relatedSkill != ?skill)
         }}
         ORDER BY ?label
-        LIMIT {limit}
+        LIMIT {int(limit)}
         """
         
-        result = self._execute_query(query)
+        result = self._execute_query(query, cache_group='skills')
         related = []
         seen_codes = set()
         
         for binding in result.get('results', {}).get('bindings', []):
-            code = binding.get('code', {}).get('value', '')
+            code = _v(binding, 'code')
             if code and code not in seen_codes:
                 seen_codes.add(code)
                 related.append({
                     'code': code,
-                    'name': binding.get('label', {}).get('value', '')
+                    'name': _v(binding, 'label')
                 })
         
         return related
     
+    def get_cache_stats(self):
+        """Get hit/miss counters for the SFIA lookup cache"""
+        return self._cache.stats()
+    
     def get_knowledge_graph_stats(self):
         """
         Get statistics about the knowledge graph
@@ -785,38 +1528,59 @@ class SFIAKnowledgeService:
                 'total_skill_levels': 0
             }
         
-        queries = {
-            'total_triples': """
-                SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }
-            """,
-            'total_skills': f"""
-                {self.prefixes}
-                SELECT (COUNT(?skill) as ?count) WHERE {{ ?skill a sfia:Skill }}
-            """,
-            'total_categories': f"""
-                {self.prefixes}
-                SELECT (COUNT(?category) as ?count) WHERE {{ ?category a sfia:Category }}
-            """,
-            'total_levels': f"""
-                {self.prefixes}
-                SELECT (COUNT(?level) as ?count) WHERE {{ ?level a sfia:Level }}
-            """,
-            'total_skill_levels': f"""
-                {self.prefixes}
-                SELECT (COUNT(?skillLevel) as ?count) WHERE {{ ?skillLevel a sfia:SkillLevel }}
-            """
-        }
+        cached = self._stats_cache.get('stats')
+        if cached is not None:
+            return cached
+        
+        result = self._execute_query(self._knowledge_graph_stats_query())
+        return self._collect_knowledge_graph_stats(result)
+    
+    async def aget_knowledge_graph_stats(self):
+        """
+        Async variant of get_knowledge_graph_stats
+        
+        Returns:
+            Statistics including counts of skills, levels, categories, etc.
+        """
+        if not self.enabled:
+            return self.get_knowledge_graph_stats()
+        
+        cached = self._stats_cache.get('stats')
+        if cached is not None:
+            return cached
+        
+        result = await self._aexecute_query(self._knowledge_graph_stats_query())
+        return self._collect_knowledge_graph_stats(result)
+    
+    def _knowledge_graph_stats_query(self):
+        """Count query behind get_knowledge_graph_stats (one subselect per stat, one round trip)"""
+        return f"""
+        {self.prefixes}
+        
+        SELECT ?total_triples ?total_skills ?total_categories ?total_levels ?total_skill_levels
+        WHERE {{
+            {{ SELECT (COUNT(*) as ?total_triples) WHERE {{ ?s ?p ?o }} }}
+            {{ SELECT (COUNT(?skill) as ?total_skills) WHERE {{ ?skill a sfia:Skill }} }}
+            {{ SELECT (COUNT(?category) as ?total_categories) WHERE {{ ?category a sfia:Category }} }}
+            {{ SELECT (COUNT(?level) as ?total_levels) WHERE {{ ?level a sfia:Level }} }}
+            {{ SELECT (COUNT(?skillLevel) as ?total_skill_levels) WHERE {{ ?skillLevel a sfia:SkillLevel }} }}
+        }}
+        """
+    
+    def _collect_knowledge_graph_stats(self, result):
+        """Build (and cache, if complete) the stats dict from the count query result"""
+        keys = ('total_triples', 'total_skills', 'total_categories', 'total_levels', 'total_skill_levels')
+        bindings = result.get('results', {}).get('bindings', [])
+        if not bindings:
+            # The query failed (_execute_query logged why); report zeros without caching them
+            logger.error("Error getting knowledge graph stats: no results")
+            return {'connected': True, **{key: 0 for key in keys}}
         
         stats = {'connected': True}
-        for key, query in queries.items():
-            try:
-                result = self._execute_query(query)
-                count = result['results']['bindings'][0]['count']['value']
-                stats[key] = int(count)
-            except Exception as e:
-                logger.error(f"Error getting {key}: {str(e)}")
-                stats[key] = 0
+        for key in keys:
+            stats[key] = int(_v(bindings[0], key, 0))
         
+        self._stats_cache.set('stats', stats)
         return stats
     
     def custom_query(self, sparql_query):
@@ -863,5 +1627,7 @@ def get_sfia_service(fuseki_url=None, dataset=None):
 def reset_service():
     """Reset the singleton instance (useful for testing)"""
     global _service_instance
+    if _service_instance is not None:
+        _service_instance.close()
     _service_instance = None
     SFIAKnowledgeService._connection_validated = False
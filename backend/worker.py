@@ -0,0 +1,16 @@
+"""
+Enhancement worker
+Consumes JD enhancement jobs queued through /api/enhance-jd/jobs
+
+Usage:
+    python worker.py
+"""
+
+# Load environment variables from .env file
+from dotenv import load_dotenv
+load_dotenv()
+
+from services.job_queue import run_worker
+
+if __name__ == '__main__':
+    run_worker()